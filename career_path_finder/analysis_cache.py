@@ -0,0 +1,171 @@
+"""
+Content-addressed cache of text analysis results for Career Path Finder
+"""
+
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+def normalize_text(text):
+    """Lowercase and collapse whitespace so trivially different answers share an entry"""
+    return " ".join(text.lower().split())
+
+def cache_key(backend_id, text):
+    """Hash of the analyzer backend and the normalized text"""
+    return hashlib.sha256(f"{backend_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """Two-level cache: an in-memory LRU in front of an optional SQLite file
+    
+    The SQLite layer survives restarts and can be shared by worker processes.
+    New entries and the last use of entries read from it are written in one
+    transaction by flush(), which runs after every batch and otherwise once
+    flush_size changes or flush_interval seconds have accumulated, so reads
+    never wait on a commit. It evicts least recently used entries once the
+    stored results, of every process sharing the file, exceed max_db_bytes.
+    """
+    
+    # Pending changes that trigger a flush, and the longest they wait, in seconds
+    flush_size = 256
+    flush_interval = 1.0
+    
+    def __init__(self, max_entries=4096, db_path=None, max_db_bytes=64 * 1024 * 1024):
+        """Initialize the cache; db_path enables the persistent layer"""
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_db_bytes = max_db_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._pending = {}  # Key -> encoded value not yet written
+        self._touched = {}  # Key -> time of last use not yet written
+        self._last_flush = time.monotonic()
+        if db_path:
+            self._open_db()
+            # Entries added since the last flush would otherwise be lost when the process ends
+            atexit.register(self.flush)
+    
+    def open(self):
+        """Reopen the SQLite layer after close(), e.g. in a process forked while it was closed"""
+        with self._lock:
+            if self.db_path and self._db is None:
+                self._open_db()
+    
+    def _open_db(self):
+        """Open the SQLite layer and create its table"""
+        self._db = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS analysis_last_used ON analysis (last_used)")
+        self._db.commit()
+    
+    def get(self, key):
+        """Return the cached result for a key, or None"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+            
+            if self._db is not None:
+                encoded = self._pending.get(key)
+                if encoded is None:
+                    row = self._db.execute("SELECT value FROM analysis WHERE key = ?", (key,)).fetchone()
+                    encoded = row[0] if row is not None else None
+                if encoded is not None:
+                    self._touched[key] = time.time()
+                    value = json.loads(encoded)
+                    self._remember(key, value)
+                    self.hits += 1
+                    self._flush_if_due()
+                    return value
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key, value):
+        """Store a result in both layers; the SQLite layer is written by the next flush"""
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._pending[key] = json.dumps(value)
+                self._touched.pop(key, None)
+                self._flush_if_due()
+    
+    def flush(self):
+        """Write pending entries and last-use times to the SQLite layer in one transaction"""
+        with self._lock:
+            self._flush()
+    
+    def _flush_if_due(self):
+        """Flush once enough changes have accumulated or the oldest has waited long enough"""
+        if (len(self._pending) + len(self._touched) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self._flush()
+    
+    def _flush(self):
+        """Write pending changes; the caller holds the lock"""
+        self._last_flush = time.monotonic()
+        if self._db is None or not (self._pending or self._touched):
+            return
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO analysis (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+            [(key, encoded, len(encoded), now) for key, encoded in self._pending.items()]
+        )
+        self._db.executemany("UPDATE analysis SET last_used = ? WHERE key = ?",
+                             [(last_used, key) for key, last_used in self._touched.items()])
+        self._pending.clear()
+        self._touched.clear()
+        # Other processes write to the same file, so its size is read rather than tracked here
+        stored = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM analysis").fetchone()[0]
+        if stored > self.max_db_bytes:
+            self._evict(stored)
+        self._db.commit()
+    
+    def _remember(self, key, value):
+        """Insert into the in-memory LRU, dropping the least recently used entry when full"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _evict(self, stored):
+        """Delete least recently used rows until the store is back under 90% of its budget"""
+        target = self.max_db_bytes * 0.9
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM analysis ORDER BY last_used"):
+            if stored - freed <= target:
+                break
+            doomed.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM analysis WHERE key = ?", doomed)
+    
+    def clear(self):
+        """Remove every entry from both layers"""
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analysis")
+                self._db.commit()
+    
+    def close(self):
+        """Flush and close the SQLite layer"""
+        with self._lock:
+            if self._db is not None:
+                self._flush()
+                self._db.close()
+                self._db = None
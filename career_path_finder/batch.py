@@ -0,0 +1,255 @@
+"""
+Batch scoring of pre-collected profiles for Career Path Finder
+"""
+
+import os
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from rich.console import Console
+from rich.table import Table
+
+from .metrics import increment, span
+from .results_store import ResultsStore
+from .scorers import SCORERS
+from .workers import build_engine, collect, create_worker_pool, score_many_in_worker
+from .scoring_engine import combine_inputs, validate_profile
+
+# Initialize Rich console on stderr so results can be piped
+console = Console(stderr=True)
+
+def read_profiles(input_file):
+    """Yield (line number, profile or error) pairs from a JSONL file, skipping blank lines"""
+    for line_number, line in enumerate(input_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            profile = json.loads(line)
+            validate_profile(profile)
+        except ValueError as e:
+            yield line_number, e
+        else:
+            yield line_number, profile
+
+def chunked(items, size):
+    """Yield lists of up to size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_batch(input_path, output_path, engine=None, seed=None, spacy_model=None,
+              batch_size=64, n_process=1, chunk_size=1000, scorer="heuristic", fuzzy_skills=True,
+              cache_db=None, results_db=None, top_careers=None):
+    """Score every profile in a JSONL file and write one JSON result per line
+    
+    Profiles are read chunk_size at a time and their text is analyzed in
+    batches of batch_size across n_process processes. With results_db, each
+    result is also recorded in that ResultsStore file.
+    """
+    if engine is None:
+        engine = build_engine(scorer=scorer, spacy_model=spacy_model, fuzzy_skills=fuzzy_skills,
+                              seed=seed, cache_db=cache_db, top_careers=top_careers)
+    
+    store = ResultsStore(results_db) if results_db else None
+    scored = 0
+    failed = 0
+    try:
+        with open(input_path, 'r') as input_file, open(output_path, 'w') as output_file:
+            for chunk in chunked(read_profiles(input_file), chunk_size):
+                profiles = []
+                for line_number, profile in chunk:
+                    if isinstance(profile, Exception):
+                        console.print(f"[yellow]Skipping profile on line {line_number}: {str(profile)}[/yellow]")
+                        failed += 1
+                    else:
+                        profiles.append(profile)
+                
+                try:
+                    with span("batch.score_chunk"):
+                        results = list(engine.score_many(profiles, batch_size=batch_size, n_process=n_process))
+                except Exception as e:
+                    console.print(f"[bold red]Error scoring profiles: {str(e)}[/bold red]")
+                    failed += len(profiles)
+                    continue
+                
+                with span("batch.write_chunk"):
+                    for profile, profile_results in zip(profiles, results):
+                        payload = profile_results.to_dict()
+                        output_file.write(json.dumps({"name": profile.get("name", ""), **payload}) + "\n")
+                        if store is not None:
+                            store.add(profile.get("name", ""), payload)
+                        scored += 1
+    finally:
+        if store is not None:
+            store.close()
+    
+    increment("batch.profiles_scored", scored)
+    increment("batch.profiles_failed", failed)
+    
+    return scored, failed
+
+def stream_profiles(input_file, output_file, workers=None, window=None, ordered=True, chunk_size=32, **engine_options):
+    """Score JSONL profiles from input_file and write each result line to output_file as soon as it is ready
+    
+    Profiles are scored chunk_size at a time on a pool of warm worker
+    processes, or in this process with workers=0. At most window chunks
+    (default: two per worker) are in flight, so memory stays constant
+    however long the input is, and a slow reader of output_file stops more
+    input from being read. Ordered output keeps input order; unordered
+    output writes each chunk as soon as it is done. Returns (scored, failed).
+    """
+    counts = {"scored": 0, "failed": 0}
+    
+    def profile_chunks():
+        for chunk in chunked(read_profiles(input_file), chunk_size):
+            profiles = []
+            for line_number, profile in chunk:
+                if isinstance(profile, Exception):
+                    console.print(f"[yellow]Skipping profile on line {line_number}: {str(profile)}[/yellow]")
+                    counts["failed"] += 1
+                else:
+                    profiles.append(profile)
+            if profiles:
+                yield profiles
+    
+    def write(profiles, results):
+        with span("stream.write_chunk"):
+            for profile, payload in zip(profiles, results):
+                output_file.write(json.dumps({"name": profile.get("name", ""), **payload}) + "\n")
+            output_file.flush()
+        counts["scored"] += len(profiles)
+    
+    def finish(profiles, future):
+        try:
+            results = collect(future.result())
+        except Exception as e:
+            console.print(f"[bold red]Error scoring profiles: {str(e)}[/bold red]")
+            counts["failed"] += len(profiles)
+        else:
+            write(profiles, results)
+    
+    if workers == 0:
+        engine = build_engine(**engine_options)
+        for profiles in profile_chunks():
+            try:
+                with span("stream.score_chunk"):
+                    results = [profile_results.to_dict() for profile_results in engine.score_many(profiles)]
+            except Exception as e:
+                console.print(f"[bold red]Error scoring profiles: {str(e)}[/bold red]")
+                counts["failed"] += len(profiles)
+                continue
+            write(profiles, results)
+    else:
+        workers = workers or os.cpu_count() or 1
+        window = max(1, window or 2 * workers)
+        pool = create_worker_pool(workers, **engine_options)
+        # (profiles, future) pairs in input order, or profiles by future when unordered
+        pending = deque() if ordered else {}
+        try:
+            for profiles in profile_chunks():
+                if ordered:
+                    # Write what is done at the head; wait for it only when the window is full
+                    while pending and (len(pending) >= window or pending[0][1].done()):
+                        finish(*pending.popleft())
+                    pending.append((profiles, pool.submit(score_many_in_worker, profiles)))
+                else:
+                    done = [future for future in pending if future.done()]
+                    if not done and len(pending) >= window:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(pending.pop(future), future)
+                    pending[pool.submit(score_many_in_worker, profiles)] = profiles
+            
+            if ordered:
+                while pending:
+                    finish(*pending.popleft())
+            else:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(pending.pop(future), future)
+        finally:
+            pool.shutdown(cancel_futures=True)
+    
+    increment("stream.profiles_scored", counts["scored"])
+    increment("stream.profiles_failed", counts["failed"])
+    
+    return counts["scored"], counts["failed"]
+
+def compare_scorers(input_path, scorer_names, spacy_model=None, batch_size=64, n_process=1):
+    """Score the same profiles with several backends and report throughput and agreement
+    
+    Text analysis runs once and is shared, so the timings cover scoring only.
+    Agreement is measured against the first scorer in scorer_names. Other
+    scorers that cannot be built, such as 'learned' before any weights are
+    trained, are skipped with a warning.
+    """
+    engine = build_engine(scorer=scorer_names[0], spacy_model=spacy_model)
+    
+    with open(input_path, 'r') as input_file:
+        profiles = [profile for _, profile in read_profiles(input_file) if isinstance(profile, dict)]
+    all_inputs = [combine_inputs(profile) for profile in profiles]
+    nlp_results = list(engine.nlp_analyzer.analyze_many(all_inputs, batch_size=batch_size, n_process=n_process))
+    
+    rankings = {}
+    report = []
+    for name in scorer_names:
+        start = time.perf_counter()
+        try:
+            # Built afresh rather than through create_scorer, whose per-catalog copy of the reference already exists
+            scorer = SCORERS[name](engine.catalog)
+        except FileNotFoundError as e:
+            console.print(f"[yellow]Skipping {name}: {str(e)}[/yellow]")
+            continue
+        build_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        all_scores = scorer.score_many(all_inputs, nlp_results)
+        score_seconds = time.perf_counter() - start
+        
+        rankings[name] = [[dharma_type for dharma_type, _ in engine.top_dharmas(scores)] for scores in all_scores]
+        report.append({
+            "scorer": name,
+            "profiles": len(profiles),
+            "build_seconds": build_seconds,
+            "score_seconds": score_seconds,
+            "profiles_per_second": len(profiles) / score_seconds if score_seconds else float("inf")
+        })
+    
+    reference = rankings[scorer_names[0]]
+    for entry in report:
+        ranking = rankings[entry["scorer"]]
+        pairs = list(zip(reference, ranking))
+        entry["top1_agreement"] = sum(1 for ref, other in pairs if ref[:1] == other[:1]) / len(pairs) if pairs else 0.0
+        entry["top2_overlap"] = sum(len(set(ref) & set(other)) / len(ref) for ref, other in pairs) / len(pairs) if pairs else 0.0
+    
+    return report
+
+def print_comparison(report):
+    """Display a scorer comparison as a table"""
+    table = Table(title="Scorer Comparison")
+    table.add_column("Scorer")
+    table.add_column("Profiles", justify="right")
+    table.add_column("Build (s)", justify="right")
+    table.add_column("Score (s)", justify="right")
+    table.add_column("Profiles/s", justify="right")
+    table.add_column("Top-1 agreement", justify="right")
+    table.add_column("Top-2 overlap", justify="right")
+    for entry in report:
+        table.add_row(
+            entry["scorer"],
+            str(entry["profiles"]),
+            f"{entry['build_seconds']:.3f}",
+            f"{entry['score_seconds']:.3f}",
+            f"{entry['profiles_per_second']:.0f}",
+            f"{entry['top1_agreement']:.1%}",
+            f"{entry['top2_overlap']:.1%}"
+        )
+    console.print(table)
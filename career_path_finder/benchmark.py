@@ -0,0 +1,241 @@
+"""
+Benchmark suite for the Career Path Finder scoring and analysis hot paths
+"""
+
+import os
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+from rich.console import Console
+from rich.table import Table
+
+from . import __version__
+from .catalog import CompiledCatalog
+from .data_manager import DataManager
+from .nlp_analyzer import NLPAnalyzer
+from .scoring_engine import ScoringEngine, combine_inputs
+from .synthetic import SyntheticDataGenerator
+
+# Initialize Rich console
+console = Console()
+
+# Synthetic workload per size: catalog shape, words per profile and profiles timed
+BENCHMARK_SIZES = {
+    "small": {"dharmas": 8, "careers": 6, "keywords": 9, "words": 20, "profiles": 200},
+    "medium": {"dharmas": 100, "careers": 20, "keywords": 30, "words": 100, "profiles": 200},
+    "large": {"dharmas": 500, "careers": 50, "keywords": 60, "words": 400, "profiles": 100},
+}
+
+# Relative slowdown of p50 latency or throughput reported as a regression
+DEFAULT_THRESHOLD = 0.2
+
+def measure(function, inputs):
+    """Call function on each input and return throughput and latency statistics"""
+    latencies = []
+    start = time.perf_counter()
+    for item in inputs:
+        call_start = time.perf_counter()
+        function(item)
+        latencies.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+    
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+    return {
+        "calls": len(latencies),
+        "throughput": len(latencies) / total if total else float("inf"),
+        "p50_ms": percentile(0.50) * 1000,
+        "p99_ms": percentile(0.99) * 1000
+    }
+
+def measure_memory(function, inputs):
+    """Keep the result of function for every input and return the memory used per result
+    
+    retained_bytes is what the kept results occupy; peak_bytes also counts
+    temporary allocations while they were built. Warm up any caches first
+    so only the results themselves are counted.
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        kept = [function(item) for item in inputs]
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    count = max(1, len(kept))
+    return {
+        "calls": len(kept),
+        "retained_bytes": (current - baseline) / count,
+        "peak_bytes": (peak - baseline) / count
+    }
+
+class BenchmarkSuite:
+    """Times the hot paths on synthetic inputs and catalogs of several sizes"""
+    
+    def __init__(self, sizes=tuple(BENCHMARK_SIZES), seed=0, load_repeats=20, compile_repeats=3):
+        """Initialize the suite with the sizes to run"""
+        self.sizes = sizes
+        self.seed = seed
+        self.load_repeats = load_repeats
+        self.compile_repeats = compile_repeats
+    
+    def run(self):
+        """Run every benchmark and return a JSON-serializable report"""
+        results = {}
+        memory = {}
+        # One analyzer shared by every size; caching is off so the real work is timed
+        analyzer = NLPAnalyzer(cache=False)
+        
+        for size in self.sizes:
+            shape = BENCHMARK_SIZES[size]
+            generator = SyntheticDataGenerator(seed=f"{self.seed}-{size}")
+            catalog = generator.catalog(shape["dharmas"], shape["careers"], shape["keywords"])
+            profiles = list(generator.profiles(shape["profiles"], catalog, words_per_answer=max(1, shape["words"] // 7)))
+            texts = [combine_inputs(profile) for profile in profiles]
+            
+            console.print(f"[cyan]Running {size} benchmarks...[/cyan]")
+            results.update(self._run_loading(size, catalog))
+            
+            # analyze_results delegates to ScoringEngine.score once the UI is stripped away
+            engine = ScoringEngine(catalog, nlp_analyzer=analyzer, seed=self.seed)
+            engine.score(profiles[0])  # Build lazy indexes before timing
+            results[f"analyze_results/{size}"] = measure(engine.score, profiles)
+            
+            # Memory per scored profile, as kept by the engine and as plain dicts
+            memory[f"score_memory/{size}"] = measure_memory(engine.score, profiles)
+            memory[f"score_memory_dicts/{size}"] = measure_memory(lambda profile: engine.score(profile).to_dict(), profiles)
+            
+            # "Careers like this one" lookups against the whole catalog
+            titles = [career["title"] for data in catalog.values() for career in data["careers"]]
+            engine.similar_careers(titles[0])  # Warm up before timing
+            results[f"similar_careers/{size}"] = measure(engine.similar_careers, titles[:200])
+            
+            results[f"analyze_simple/{size}"] = measure(analyzer._analyze_simple, texts)
+            if analyzer.spacy_available:
+                results[f"analyze_with_spacy/{size}"] = measure(analyzer._analyze_with_spacy, texts)
+        
+        return {
+            "meta": {
+                "version": __version__,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "spacy": analyzer.spacy_available,
+                "timestamp": time.time(),
+                "seed": self.seed
+            },
+            "results": results,
+            "memory": memory
+        }
+    
+    def _run_loading(self, size, catalog):
+        """Time DataManager loading of a catalog written to a temporary directory"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dharma_data.json")
+            with open(path, 'w') as f:
+                json.dump(catalog, f)
+            data_manager = DataManager(path)
+            data_manager.load_compiled_catalog()  # Write the compiled cache once
+            guidance = data_manager.load_guidance_data()
+            
+            repeats = range(self.load_repeats)
+            return {
+                f"load_dharma_data/{size}": measure(lambda _: data_manager.load_dharma_data(), repeats),
+                # What load_compiled_catalog saves when its cache is fresh
+                f"compile_catalog/{size}": measure(lambda _: CompiledCatalog(catalog, guidance).precompute(), range(self.compile_repeats)),
+                f"load_compiled_catalog/{size}": measure(lambda _: data_manager.load_compiled_catalog(), repeats)
+            }
+
+def compare_reports(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return the benchmarks that got slower than the baseline by more than threshold"""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        p50_change = result["p50_ms"] / previous["p50_ms"] - 1 if previous["p50_ms"] else 0.0
+        throughput_change = previous["throughput"] / result["throughput"] - 1 if result["throughput"] else 0.0
+        if p50_change > threshold or throughput_change > threshold:
+            regressions.append({
+                "benchmark": name,
+                "p50_change": p50_change,
+                "throughput_change": -throughput_change
+            })
+    
+    for name, result in current.get("memory", {}).items():
+        previous = baseline.get("memory", {}).get(name)
+        if previous is None or not previous["retained_bytes"]:
+            continue
+        memory_change = result["retained_bytes"] / previous["retained_bytes"] - 1
+        if memory_change > threshold:
+            regressions.append({"benchmark": name, "memory_change": memory_change})
+    return regressions
+
+def print_report(report, baseline=None):
+    """Display benchmark results, with changes against a baseline if given"""
+    table = Table(title="Career Path Finder Benchmarks")
+    table.add_column("Benchmark")
+    table.add_column("Calls", justify="right")
+    table.add_column("Throughput (/s)", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    if baseline is not None:
+        table.add_column("p50 vs baseline", justify="right")
+    
+    for name, result in report["results"].items():
+        row = [name, str(result["calls"]), f"{result['throughput']:.1f}", f"{result['p50_ms']:.3f}", f"{result['p99_ms']:.3f}"]
+        if baseline is not None:
+            previous = baseline.get("results", {}).get(name)
+            row.append(f"{result['p50_ms'] / previous['p50_ms'] - 1:+.1%}" if previous and previous["p50_ms"] else "-")
+        table.add_row(*row)
+    console.print(table)
+    
+    if report.get("memory"):
+        table = Table(title="Memory Per Scored Profile")
+        table.add_column("Benchmark")
+        table.add_column("Profiles", justify="right")
+        table.add_column("Retained (KiB)", justify="right")
+        table.add_column("Peak (KiB)", justify="right")
+        if baseline is not None:
+            table.add_column("Retained vs baseline", justify="right")
+        
+        for name, result in report["memory"].items():
+            row = [name, str(result["calls"]), f"{result['retained_bytes'] / 1024:.2f}", f"{result['peak_bytes'] / 1024:.2f}"]
+            if baseline is not None:
+                previous = baseline.get("memory", {}).get(name)
+                row.append(f"{result['retained_bytes'] / previous['retained_bytes'] - 1:+.1%}"
+                           if previous and previous["retained_bytes"] else "-")
+            table.add_row(*row)
+        console.print(table)
+
+def run_benchmarks(sizes=tuple(BENCHMARK_SIZES), save_path=None, baseline_path=None, threshold=DEFAULT_THRESHOLD, seed=0):
+    """Run the suite, optionally saving a baseline and checking against a previous one
+    
+    Returns the list of regressions, empty when none were found.
+    """
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)
+    
+    report = BenchmarkSuite(sizes, seed=seed).run()
+    print_report(report, baseline)
+    
+    if save_path:
+        with open(save_path, 'w') as f:
+            json.dump(report, f, indent=4)
+        console.print(f"[green]Benchmark results saved to {save_path}[/green]")
+    
+    regressions = compare_reports(report, baseline, threshold) if baseline else []
+    for regression in regressions:
+        if "memory_change" in regression:
+            console.print(f"[bold red]Regression in {regression['benchmark']}: "
+                          f"memory {regression['memory_change']:+.1%}[/bold red]")
+        else:
+            console.print(f"[bold red]Regression in {regression['benchmark']}: "
+                          f"p50 {regression['p50_change']:+.1%}, throughput {regression['throughput_change']:+.1%}[/bold red]")
+    if baseline and not regressions:
+        console.print(f"[green]No regressions beyond {threshold:.0%} against {baseline_path}[/green]")
+    return regressions
@@ -2,38 +2,36 @@
 Main CareerFinder class for the Career Path Finder application
 """
 
-import os
-import time
-import random
 import questionary
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
+from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
 from .utils import start_nltk_download
+from .daemon import DaemonError, connect_daemon
 from .data_manager import DataManager
+from .incremental import IncrementalAnalyzer
 from .nlp_analyzer import NLPAnalyzer
-
-# Try to load spaCy model, fall back to simpler analysis if not available
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-    SPACY_AVAILABLE = True
-except:
-    nlp = None
-    SPACY_AVAILABLE = False
+from .scoring_engine import SCORE_STAGES, ScoringEngine
+from .metrics import timed
+from .pacing import get_pacing
 
 # Initialize Rich console
 console = Console()
 
-# Start NLTK download in background
-nltk_thread = start_nltk_download()
-
 class CareerFinder:
     """Main class for the Career Path Finder application"""
     
-    def __init__(self):
-        """Initialize the Career Finder application"""
+    def __init__(self, pacing=None, use_daemon=True):
+        """Initialize the Career Finder application
+        
+        pacing names a profile from PACING_PROFILES; by default sessions at a
+        terminal pause between screens and scripted sessions do not. With
+        use_daemon, answers are analyzed by a running `career-path-finder
+        daemon` if there is one, so nothing heavy is loaded here.
+        """
+        self.pacing = get_pacing(pacing)
         self.user_data = {
             "name": "",
             "passions": [],
@@ -46,133 +44,28 @@ class CareerFinder:
         
         # Initialize components
         self.data_manager = DataManager()
-        self.nlp_analyzer = NLPAnalyzer(nlp if SPACY_AVAILABLE else None)
+        self.nlp_analyzer = None
+        self.engine = None
+        self.dharma_paths = None
         
-        # Load dharma descriptions and career paths
-        self.dharma_paths = self.data_manager.load_dharma_data()
+        # A running daemon already holds a warm analyzer and catalog; otherwise load them here
+        self.background = connect_daemon() if use_daemon else None
+        if self.background is None:
+            self._load_engine()
+    
+    def _load_engine(self):
+        """Load the analyzer and catalog in this process and analyze answers in the background"""
+        # Check NLTK resources in background while the user answers; downloads only missing ones
+        start_nltk_download()
         
-        # Personalized messages for different dharma types
-        self.personalized_messages = {
-            "helping_others_grow": [
-                "You have a natural gift for bringing out the best in others.",
-                "Your ability to see potential in people is remarkable.",
-                "You find joy in witnessing others' growth and development.",
-                "Teaching and mentoring seem to come naturally to you."
-            ],
-            "creating_and_innovating": [
-                "You have a natural drive to bring new ideas into reality.",
-                "Your creative energy is a powerful force that seeks expression.",
-                "You see possibilities where others see limitations.",
-                "Building and creating seems to be in your DNA."
-            ],
-            "solving_problems": [
-                "You have a natural talent for finding solutions to complex challenges.",
-                "Your analytical mind thrives when tackling difficult problems.",
-                "You see obstacles as puzzles waiting to be solved.",
-                "Finding better ways to do things energizes you."
-            ],
-            "caring_for_others": [
-                "Your compassionate nature is a gift to those around you.",
-                "You have a natural ability to sense others' needs and respond with care.",
-                "Supporting others through difficult times gives you a sense of purpose.",
-                "Your empathy allows you to connect deeply with others."
-            ],
-            "organizing_and_planning": [
-                "Your ability to create order from chaos is remarkable.",
-                "Your talent for seeing the big picture while managing details is a rare gift.",
-                "You find satisfaction in systems that run smoothly and efficiently.",
-                "Planning and coordinating seem to come naturally to you."
-            ],
-            "expressing_creativity": [
-                "Your creative spirit seeks outlets for expression.",
-                "You see the world through a unique lens that others benefit from.",
-                "Bringing beauty and meaning into the world drives you.",
-                "Your imagination is a powerful tool for innovation."
-            ],
-            "discovering_knowledge": [
-                "Your curious mind constantly seeks deeper understanding.",
-                "You find joy in the pursuit of knowledge and insight.",
-                "Learning and sharing wisdom seems central to who you are.",
-                "Your analytical nature helps you uncover hidden truths."
-            ],
-            "leading_and_inspiring": [
-                "You have a natural ability to inspire others toward a shared vision.",
-                "Your leadership qualities draw people to follow your guidance.",
-                "You see potential in groups that others might miss.",
-                "Bringing people together for a common purpose energizes you."
-            ]
-        }
+        self.nlp_analyzer = NLPAnalyzer()  # spaCy is loaded on first analysis
         
-        # Career alignment explanations (more varied and specific)
-        self.alignment_explanations = {
-            "Teacher/Professor": [
-                "This role lets you directly shape minds and witness the 'aha' moments when students grasp new concepts.",
-                "As an educator, you'll guide others through their learning journey, helping them discover their own potential.",
-                "Teaching allows you to create transformative learning experiences that change how people see themselves and the world."
-            ],
-            "Corporate Trainer": [
-                "As a trainer in industry, you'll help professionals develop skills that transform their careers and confidence.",
-                "This role lets you combine technical expertise with your passion for developing others' potential.",
-                "You'll design learning experiences that help professionals overcome challenges and reach new heights."
-            ],
-            "Coach": [
-                "Coaching allows you to walk alongside others as they navigate their personal and professional growth.",
-                "This role lets you ask powerful questions that help others discover their own answers and potential.",
-                "As a coach, you'll create a safe space for transformation and breakthrough moments."
-            ],
-            "Software Developer": [
-                "This role allows you to create solutions that solve real problems and improve people's lives.",
-                "As a developer, you'll build digital experiences that transform how people work and connect.",
-                "This path lets you express your creativity through code, bringing new possibilities into existence."
-            ],
-            "Product Designer": [
-                "Design work allows you to shape how people experience and interact with the world around them.",
-                "This role lets you solve human problems through thoughtful, creative design solutions.",
-                "As a designer, you'll create products that seamlessly blend form and function to enhance lives."
-            ],
-            "Consultant": [
-                "Consulting lets you tackle a variety of complex problems across different organizations and industries.",
-                "This role allows you to analyze situations from multiple angles and develop innovative solutions.",
-                "As a consultant, you'll help organizations overcome their biggest challenges and reach their potential."
-            ],
-            "Engineer": [
-                "Engineering allows you to apply scientific principles to create solutions to real-world problems.",
-                "This role lets you design and build systems that improve efficiency, safety, or quality of life.",
-                "As an engineer, you'll solve complex technical challenges that others might find overwhelming."
-            ],
-            "Healthcare Professional": [
-                "This path allows you to provide care and comfort to people during their most vulnerable moments.",
-                "As a healthcare provider, you'll make a direct impact on people's wellbeing and quality of life.",
-                "This role lets you combine technical expertise with deep compassion to heal and support others."
-            ],
-            "Project Manager": [
-                "This role lets you orchestrate complex initiatives, bringing order to multifaceted challenges.",
-                "As a project manager, you'll guide teams through uncertainty toward successful outcomes.",
-                "This path allows you to create systems and processes that make ambitious goals achievable."
-            ],
-            "Graphic Designer": [
-                "This role allows you to communicate powerful messages through visual storytelling.",
-                "As a designer, you'll create work that evokes emotion and inspires action.",
-                "This path lets you transform abstract concepts into tangible visual experiences."
-            ],
-            "Researcher": [
-                "Research allows you to push the boundaries of what's known and discover new insights.",
-                "This role lets you dive deep into questions that fascinate you and share your findings with the world.",
-                "As a researcher, you'll contribute to humanity's collective knowledge and understanding."
-            ],
-            "Team Leader/Manager": [
-                "This role lets you build and nurture teams that accomplish more together than individuals could alone.",
-                "As a leader, you'll help team members develop their strengths and navigate challenges.",
-                "This path allows you to create environments where people feel empowered to do their best work."
-            ]
-        }
+        # Load dharma descriptions and career paths from the compiled catalog
+        self.engine = ScoringEngine(nlp_analyzer=self.nlp_analyzer, catalog=self.data_manager.load_compiled_catalog())
+        self.dharma_paths = self.engine.dharma_paths
         
-        # For other careers not specifically listed
-        self.generic_alignments = [
-            "This role allows you to express your dharma by creating value through your natural gifts and inclinations.",
-            "This path provides a platform where your unique strengths can make a meaningful difference.",
-            "In this role, you can align your work with your deeper purpose, bringing fulfillment beyond just earning a living."
-        ]
+        # Answers are analyzed in the background as soon as they are entered
+        self.background = IncrementalAnalyzer(self.engine)
     
     def welcome(self):
         """Display welcome message and introduction"""
@@ -185,11 +78,11 @@ class CareerFinder:
             title="🌟 Find Your True Calling 🌟",
             border_style="cyan"
         ))
-        time.sleep(1)
+        self.pacing.pause("intro")
         
         self.user_data["name"] = questionary.text("What's your name?").ask()
         console.print(f"\n[green]Great to meet you, {self.user_data['name']}! Let's begin your journey of self-discovery.[/green]")
-        time.sleep(1)
+        self.pacing.pause("greeting")
 
     def explore_passions(self):
         """Guide user through questions about their passions and interests"""
@@ -201,7 +94,7 @@ class CareerFinder:
             title="✨ Soul Searching ✨",
             border_style="yellow"
         ))
-        time.sleep(1)
+        self.pacing.pause("intro")
         
         # Childhood memories
         console.print("\n[bold]Think back to your childhood...[/bold]")
@@ -216,6 +109,7 @@ class CareerFinder:
             if answer and answer.strip():
                 self.user_data["childhood_memories"].append(answer)
                 self.user_data["responses_raw"].append(answer)  # Store for NLP analysis
+                self.background.submit("childhood_memories", len(self.user_data["childhood_memories"]) - 1, answer)
         
         # Current passions
         console.print("\n[bold]Now think about your current life...[/bold]")
@@ -230,6 +124,7 @@ class CareerFinder:
             if answer and answer.strip():
                 self.user_data["passions"].append(answer)
                 self.user_data["responses_raw"].append(answer)  # Store for NLP analysis
+                self.background.submit("passions", len(self.user_data["passions"]) - 1, answer)
         
         # Impact question
         impact_answer = questionary.text(
@@ -237,6 +132,7 @@ class CareerFinder:
         ).ask()
         self.user_data["dream_impact"] = impact_answer
         self.user_data["responses_raw"].append(impact_answer)  # Store for NLP analysis
+        self.background.submit("dream_impact", 0, impact_answer)
     def assess_skills(self):
         """Gather information about user's skills and qualifications"""
         console.clear()
@@ -247,7 +143,7 @@ class CareerFinder:
             title="🛠️ Your Toolkit 🛠️",
             border_style="green"
         ))
-        time.sleep(1)
+        self.pacing.pause("intro")
         
         # Skills assessment
         console.print("\n[bold]What are your key skills?[/bold] (Enter one at a time, type 'done' when finished)")
@@ -265,6 +161,7 @@ class CareerFinder:
                 break
             self.user_data["qualifications"].append(qual)
     
+    @timed("ui.analyze_results")
     def analyze_results(self):
         """Identify true calling and suggest career paths that align with it using NLP"""
         console.clear()
@@ -276,117 +173,27 @@ class CareerFinder:
             border_style="magenta"
         ))
         
-        # Simple animation to show "thinking"
-        for _ in range(3):
-            console.print("[bold]Analyzing[/bold]", end="")
-            for _ in range(3):
-                time.sleep(0.3)
-                console.print(".", end="")
-            console.print()
-        
-        # Combine all user inputs to identify themes
-        all_inputs = " ".join(self.user_data["passions"] + 
-                             self.user_data["childhood_memories"] + 
-                             [self.user_data["dream_impact"]]).lower()
-        
-        # Use NLP to extract key themes from user responses
-        nlp_results = self.nlp_analyzer.analyze_text(all_inputs)
-        
-        # Calculate dharma scores using both keyword matching and NLP results
-        dharma_scores = {}
-        for dharma_type, data in self.dharma_paths.items():
-            score = 0
+        stage_names = [name for name, _ in SCORE_STAGES]
+        with Progress(SpinnerColumn(), TextColumn("[bold]{task.description}"), BarColumn(),
+                      console=console, transient=True) as progress:
+            task = progress.add_task(SCORE_STAGES[0][1], total=len(SCORE_STAGES))
             
-            # Score based on direct keyword matches
-            for keyword in data["keywords"]:
-                if keyword in all_inputs:
-                    score += 2  # Direct matches get higher weight
+            def report(stage):
+                # Called from the scoring thread as each stage finishes
+                done = stage_names.index(stage) + 1
+                description = SCORE_STAGES[done][1] if done < len(SCORE_STAGES) else "Done"
+                progress.update(task, completed=done, description=description)
             
-            # Score based on NLP-extracted keywords and phrases
-            for word in nlp_results["key_words"]:
-                if any(keyword in word or word in keyword for keyword in data["keywords"]):
-                    score += 1
-                    
-            for phrase in nlp_results["key_phrases"]:
-                if any(keyword in phrase for keyword in data["keywords"]):
-                    score += 1.5  # Phrases get higher weight than single words
-            
-            dharma_scores[dharma_type] = score
-        
-        # Get top 2 dharma types
-        top_dharmas = sorted(dharma_scores.items(), key=lambda x: x[1], reverse=True)[:2]
-        
-        # If no clear matches, use some defaults
-        if top_dharmas[0][1] == 0:
-            # Default to helping others and creating things if no keywords matched
-            top_dharmas = [("helping_others_grow", 1), ("creating_and_innovating", 1)]
-        
-        # Prepare career suggestions based on true callings
-        career_suggestions = []
-        
-        for dharma_type, _ in top_dharmas:
-            dharma_data = self.dharma_paths[dharma_type]
-            
-            # Add careers from this dharma type
-            for career in dharma_data["careers"]:
-                # Check if user already has relevant skills
-                has_relevant_skills = False
-                skill_relevance = []
-                
-                for skill in self.user_data["skills"]:
-                    # Check if skill is relevant to this career
-                    skill_lower = skill.lower()
-                    if career["title"].lower() in skill_lower or any(keyword in skill_lower for keyword in dharma_data["keywords"]):
-                        has_relevant_skills = True
-                        skill_relevance.append(skill)
-                
-                # Generate personalized alignment explanation
-                if career["title"] in self.alignment_explanations:
-                    alignment = random.choice(self.alignment_explanations[career["title"]])
-                else:
-                    alignment = random.choice(self.generic_alignments)
-                
-                # Generate personalized skill development suggestions
-                if not has_relevant_skills:
-                    # Suggest skills based on dharma type and career
-                    suggested_skills = []
-                    if "Teacher" in career["title"] or "Trainer" in career["title"]:
-                        suggested_skills = ["communication", "curriculum development", "presentation skills"]
-                    elif "Developer" in career["title"]:
-                        suggested_skills = ["programming", "problem-solving", "technical design"]
-                    elif "Designer" in career["title"]:
-                        suggested_skills = ["visual design", "user research", "creative thinking"]
-                    elif "Manager" in career["title"] or "Leader" in career["title"]:
-                        suggested_skills = ["leadership", "team management", "strategic planning"]
-                    else:
-                        # Use some keywords from the dharma type as skill suggestions
-                        suggested_skills = [k.capitalize() for k in dharma_data["keywords"][:3]]
-                else:
-                    suggested_skills = []
-                
-                career_suggestions.append({
-                    "title": career["title"],
-                    "description": career["description"],
-                    "true_calling": dharma_type,
-                    "calling_description": dharma_data["description"],
-                    "has_relevant_skills": has_relevant_skills,
-                    "relevant_skills": skill_relevance,
-                    "suggested_skills": suggested_skills,
-                    "alignment_explanation": alignment
-                })
-        
-        # Get personalized messages for the top dharma types
-        personalized_insights = []
-        for dharma_type, _ in top_dharmas:
-            if dharma_type in self.personalized_messages:
-                personalized_insights.append(random.choice(self.personalized_messages[dharma_type]))
-        
-        return {
-            "true_callings": [self.dharma_paths[dharma_type]["description"] for dharma_type, _ in top_dharmas],
-            "career_suggestions": career_suggestions,
-            "personalized_insights": personalized_insights,
-            "nlp_keywords": nlp_results["key_words"][:5]  # Top 5 keywords for display
-        }
+            # Merge the background analysis on a worker thread so the display keeps updating
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                try:
+                    return executor.submit(self.background.finish, self.user_data, report).result()
+                except DaemonError as e:
+                    # The daemon went away during the session; analyze in this process instead
+                    console.print(f"[yellow]Daemon unavailable ({str(e)}); analyzing here instead.[/yellow]")
+                    self._load_engine()
+                    return executor.submit(self.background.finish, self.user_data, report).result()
+    @timed("ui.display_results")
     def display_results(self, results):
         """Display true calling and career suggestions to the user"""
         console.clear()
@@ -473,17 +280,19 @@ class CareerFinder:
             self.display_results(results)
             
             # Ask if user wants to save results
-            if questionary.confirm("Would you like to save your results to a file?").ask():
-                filename = f"{self.user_data['name'].lower().replace(' ', '_')}_dharma_path.json"
-                saved = self.data_manager.save_results(filename, {
-                    "user_data": self.user_data,
-                    "true_callings": results["true_callings"],
-                    "career_suggestions": results["career_suggestions"],
-                    "personalized_insights": results["personalized_insights"],
-                    "nlp_keywords": results["nlp_keywords"]
-                })
-                if saved:
-                    console.print(f"[green]Results saved to {filename}[/green]")
+            if questionary.confirm("Would you like to save your results?").ask():
+                with self.data_manager.open_results_store() as store:
+                    payload = results if isinstance(results, dict) else results.to_dict()
+                    store.add(self.user_data["name"], {
+                        "user_data": self.user_data,
+                        "true_callings": payload["true_callings"],
+                        "top_dharmas": payload["top_dharmas"],
+                        "career_suggestions": payload["career_suggestions"],
+                        "personalized_insights": payload["personalized_insights"],
+                        "nlp_keywords": payload["nlp_keywords"]
+                    })
+                if not store.failed:
+                    console.print(f"[green]Results saved. View them again with: career-path-finder results --name \"{self.user_data['name']}\"[/green]")
             
             console.print("\n[bold cyan]Thank you for using Career Path Finder![/bold cyan]")
             console.print("[italic]Remember, finding your dharma is a journey of self-discovery and service.[/italic]")
@@ -492,3 +301,5 @@ class CareerFinder:
             console.print("\n[yellow]Program interrupted. Exiting...[/yellow]")
         except Exception as e:
             console.print(f"[bold red]An error occurred: {str(e)}[/bold red]")
+        finally:
+            self.background.close()
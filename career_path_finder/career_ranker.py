@@ -0,0 +1,109 @@
+"""
+Career ranking across the whole catalog for Career Path Finder
+"""
+
+import heapq
+from collections import Counter
+
+from .fuzzy_matcher import tokenize
+from .keyword_matcher import KeywordAutomaton
+
+# Weight of each part of a career's relevance
+DHARMA_SCORE_WEIGHT = 1.0
+SKILL_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 0.5
+
+# Description terms too common to say anything about a career
+DESCRIPTION_STOP_WORDS = ("that", "with", "from", "into", "their", "your", "other", "others", "people", "through")
+
+class CareerRanker:
+    """Index over every career in a catalog for picking the K most relevant ones
+    
+    A career's relevance combines its dharma type's score, the user's skills
+    that are relevant to it and the user's key words found in its title and
+    description. Careers without matches of their own only compete through
+    their dharma type, so just the first K careers of the K best dharma
+    types are scored alongside the matched ones, and the best K are kept in
+    a bounded heap. The work and the response size depend on K and the
+    matches rather than on the size of the catalog.
+    """
+    
+    def __init__(self, catalog):
+        """Build the title automaton and description term index for a compiled catalog"""
+        self.catalog = catalog
+        self.career_keys = []
+        titles = []
+        self.term_index = {}
+        stop_words = set(tokenize(" ".join(DESCRIPTION_STOP_WORDS)))
+        for dharma_index, data in enumerate(catalog.dharma_paths.values()):
+            for career_index, career in enumerate(data["careers"]):
+                key = (dharma_index, career_index)
+                self.career_keys.append(key)
+                titles.append(catalog.career_titles_lower[dharma_index][career_index])
+                for term in set(tokenize(career["title"] + " " + career["description"])):
+                    if len(term) > 3 and term not in stop_words:
+                        self.term_index.setdefault(term, []).append(key)
+        # Same rule as suggest_careers: a skill mentioning a career's title is relevant to it
+        self.title_automaton = KeywordAutomaton(titles)
+    
+    def skill_matches(self, skill_keywords, fuzzy_matches):
+        """Return per-dharma and per-career counts of relevant skills
+        
+        skill_keywords and fuzzy_matches are the per-skill lists built by
+        ScoringEngine.suggest_careers. A skill sharing a keyword with a dharma
+        type counts for all of its careers; otherwise it counts for the careers
+        whose titles it mentions or fuzzily matches.
+        """
+        catalog = self.catalog
+        dharma_counts = Counter()
+        career_counts = Counter()
+        for (skill, skill_lower, keyword_ids), (fuzzy_keyword_ids, fuzzy_careers) in zip(skill_keywords, fuzzy_matches):
+            dharmas = catalog._dharmas_for_keywords(keyword_ids | fuzzy_keyword_ids)
+            dharma_counts.update(dharmas)
+            careers = set(fuzzy_careers)
+            careers.update(self.career_keys[title_id] for title_id in self.title_automaton.find(skill_lower))
+            career_counts.update(key for key in careers if key[0] not in dharmas)
+        return dharma_counts, career_counts
+    
+    def description_matches(self, nlp_results):
+        """Return per-career counts of the user's key word stems in career titles and descriptions"""
+        terms = set()
+        for text in nlp_results["key_words"] + nlp_results["key_phrases"]:
+            terms.update(tokenize(text))
+        counts = Counter()
+        for term in terms:
+            counts.update(self.term_index.get(term, ()))
+        return counts
+    
+    def rank(self, dharma_scores, skill_keywords, fuzzy_matches, nlp_results, count, fallback_dharmas=()):
+        """Return the count most relevant careers as (relevance, dharma index, career index), best first
+        
+        Ties keep catalog order. When nothing is relevant at all, the careers
+        of fallback_dharmas (dharma types) are ranked instead.
+        """
+        catalog = self.catalog
+        scores = [dharma_scores.get(dharma_type, 0) for dharma_type in catalog.dharma_types]
+        dharma_counts, career_counts = self.skill_matches(skill_keywords, fuzzy_matches)
+        description_counts = self.description_matches(nlp_results)
+        
+        # What every career of a dharma type scores before its own matches
+        bases = [DHARMA_SCORE_WEIGHT * score + SKILL_WEIGHT * dharma_counts[index] for index, score in enumerate(scores)]
+        
+        candidates = set(career_counts) | set(description_counts)
+        relevant_dharmas = [index for index, score in enumerate(scores) if score > 0 or dharma_counts[index]]
+        if not candidates and not relevant_dharmas:
+            relevant_dharmas = [catalog.dharma_index[dharma_type] for dharma_type in fallback_dharmas]
+        
+        # Unmatched careers score their dharma's base and ties go to the earlier career, so none
+        # outside the first count careers of the count best dharma types can make the cut
+        for dharma_index in heapq.nlargest(count, relevant_dharmas, key=lambda index: (bases[index], -index)):
+            career_total = len(catalog.career_titles_lower[dharma_index])
+            candidates.update((dharma_index, career_index) for career_index in range(min(count, career_total)))
+        
+        relevance = {
+            key: bases[key[0]] + SKILL_WEIGHT * career_counts[key] + DESCRIPTION_WEIGHT * description_counts[key]
+            for key in candidates
+        }
+        # nlargest keeps a heap of count entries; ties go to the career listed first
+        best = heapq.nlargest(count, relevance, key=lambda key: (relevance[key], -key[0], -key[1]))
+        return [(relevance[key], key[0], key[1]) for key in best]
@@ -0,0 +1,73 @@
+"""
+Career similarity index for Career Path Finder
+"""
+
+# Size of the latent vectors careers are compared by
+SIMILARITY_DIMENSIONS = 64
+
+class CareerSimilarityIndex:
+    """Latent semantic vectors of every career's title and description for "careers like this one" queries
+    
+    Careers are embedded once with TF-IDF reduced by a truncated SVD and
+    normalized, so cosine similarity is a dot product. A query is one
+    matrix-vector product over the catalog and a partial sort for the top k;
+    careers are never compared pairwise.
+    """
+    
+    def __init__(self, catalog, dimensions=SIMILARITY_DIMENSIONS):
+        """Embed every career of a compiled catalog"""
+        import numpy as np
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        self.career_keys = []
+        # Positions of every title; the same title may be listed under several dharma types
+        self.title_positions = {}
+        documents = []
+        for dharma_index, data in enumerate(catalog.dharma_paths.values()):
+            for career_index, career in enumerate(data["careers"]):
+                title_lower = catalog.career_titles_lower[dharma_index][career_index]
+                self.title_positions.setdefault(title_lower, []).append(len(self.career_keys))
+                self.career_keys.append((dharma_index, career_index))
+                # The title is repeated so it outweighs the longer description
+                documents.append(f"{career['title']} {career['title']} {career['description']}")
+        
+        try:
+            matrix = TfidfVectorizer(sublinear_tf=True, stop_words="english").fit_transform(documents)
+        except ValueError:
+            # No documents or no words beyond stop words: nothing is similar to anything
+            self.vectors = np.zeros((len(documents), 1), dtype=np.float32)
+            return
+        
+        components = min(dimensions, matrix.shape[0] - 1, matrix.shape[1] - 1)
+        vectors = TruncatedSVD(components, random_state=0).fit_transform(matrix) if components >= 1 else matrix.toarray()
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        self.vectors = (vectors / norms).astype(np.float32)
+    
+    def __contains__(self, title):
+        """Whether a career with this title (case-insensitive) is in the index"""
+        return title.strip().lower() in self.title_positions
+    
+    def similar(self, title, count=5):
+        """Return up to count (similarity, dharma index, career index) triples most like a career, best first
+        
+        Careers with the same title, including the career itself, are left
+        out. Raises KeyError for a title that is not in the catalog.
+        """
+        import numpy as np
+        
+        positions = self.title_positions.get(title.strip().lower())
+        if positions is None:
+            raise KeyError(title)
+        
+        similarities = self.vectors @ self.vectors[positions[0]]
+        similarities[positions] = -np.inf
+        count = min(count, len(similarities) - len(positions))
+        if count <= 0:
+            return []
+        
+        # Partial sort for the best count, then order just those; ties keep catalog order
+        candidates = np.argpartition(-similarities, count - 1)[:count]
+        candidates = candidates[np.lexsort((candidates, -similarities[candidates]))]
+        return [(float(similarities[position]),) + self.career_keys[position] for position in candidates.tolist()]
@@ -0,0 +1,168 @@
+"""
+Compiled dharma catalog for Career Path Finder
+"""
+
+from .career_similarity import CareerSimilarityIndex
+from .fuzzy_matcher import FuzzySkillMatcher
+from .keyword_matcher import KeywordAutomaton, is_word_start
+
+# Bump when the compiled layout changes so stale on-disk caches are rebuilt
+CATALOG_FORMAT_VERSION = 6
+
+class CompiledCatalog:
+    """Dharma catalog with keyword indexes compiled once at load time"""
+    
+    # Upper bound on memoized word and phrase lookups
+    max_cached_lookups = 65536
+    
+    # Derived structures worth keeping in the on-disk cache
+    persisted_derived = (("fuzzy_skills",), ("career_similarity",))
+    
+    def __init__(self, dharma_paths, guidance=None):
+        """Compile the keyword indexes for the given dharma data
+        
+        guidance holds the personalized messages, alignment explanations and
+        skill rules (see DataManager.load_guidance_data); they are resolved
+        into per-dharma and per-career lookups here so scoring never has to.
+        """
+        self.dharma_paths = dharma_paths
+        self.dharma_types = list(dharma_paths)
+        self.dharma_index = {dharma_type: index for index, dharma_type in enumerate(self.dharma_types)}
+        
+        # Unique keywords, each mapped to the dharma types that list it
+        self.keywords = []
+        self.keyword_dharmas = []
+        keyword_ids = {}
+        for dharma_index, data in enumerate(dharma_paths.values()):
+            for keyword in data["keywords"]:
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.keyword_dharmas.append([])
+                # Repeated keywords keep counting once per listing
+                self.keyword_dharmas[keyword_ids[keyword]].append(dharma_index)
+        
+        self.dharma_keyword_ids = [
+            frozenset(keyword_ids[keyword] for keyword in data["keywords"])
+            for data in dharma_paths.values()
+        ]
+        
+        # Lowercased career titles per dharma type, in catalog order
+        self.career_titles_lower = [
+            [career["title"].lower() for career in data["careers"]]
+            for data in dharma_paths.values()
+        ]
+        
+        self._compile_guidance(guidance or {})
+        
+        self.automaton = KeywordAutomaton(self.keywords)
+        self.fragments = self._build_fragments()
+        self._lookup_cache = {}
+        self._derived = {}
+    
+    def __getstate__(self):
+        """Pickle the compiled indexes without per-process lookup caches"""
+        state = self.__dict__.copy()
+        state["_lookup_cache"] = {}
+        state["_derived"] = {key: value for key, value in list(self._derived.items()) if key in self.persisted_derived}
+        return state
+    
+    def _compile_guidance(self, guidance):
+        """Resolve the messages of every dharma type and the alignment pool and suggested skills of every career"""
+        messages = guidance.get("personalized_messages", {})
+        self.dharma_messages = [tuple(messages.get(dharma_type, ())) for dharma_type in self.dharma_types]
+        
+        # Careers share their pool tuples: one per listed title, one generic
+        generic_alignments = tuple(guidance.get("generic_alignments", ()))
+        alignment_pools = {title: tuple(pool) for title, pool in guidance.get("alignment_explanations", {}).items()}
+        self.career_alignments = [
+            [alignment_pools.get(career["title"], generic_alignments) for career in data["careers"]]
+            for data in self.dharma_paths.values()
+        ]
+        
+        skill_rules = [(tuple(rule["title_contains"]), tuple(rule["skills"])) for rule in guidance.get("skill_rules", ())]
+        keyword_skill_count = guidance.get("keyword_skill_count", 3)
+        self.career_suggested_skills = []
+        for data in self.dharma_paths.values():
+            # Careers matching no rule use some keywords from the dharma type
+            keyword_skills = tuple(keyword.capitalize() for keyword in data["keywords"][:keyword_skill_count])
+            self.career_suggested_skills.append([
+                next((skills for fragments, skills in skill_rules
+                      if any(fragment in career["title"] for fragment in fragments)), keyword_skills)
+                for career in data["careers"]
+            ])
+    
+    def get_derived(self, key, factory):
+        """Return a structure derived from this catalog, building it on first use"""
+        if key not in self._derived:
+            self._derived[key] = factory()
+        return self._derived[key]
+    
+    def fuzzy_matcher(self):
+        """Return the fuzzy skill index for this catalog"""
+        return self.get_derived(("fuzzy_skills",), lambda: FuzzySkillMatcher(self))
+    
+    def similarity_index(self):
+        """Return the career similarity index for this catalog"""
+        return self.get_derived(("career_similarity",), lambda: CareerSimilarityIndex(self))
+    
+    def precompute(self):
+        """Build the derived structures that are stored with the on-disk cache"""
+        self.fuzzy_matcher()
+        self.similarity_index()
+        return self
+    
+    def _build_fragments(self):
+        """Map every word-aligned fragment of every keyword to its dharma types"""
+        fragments = {}
+        for keyword, dharma_indexes in zip(self.keywords, self.keyword_dharmas):
+            for start in range(len(keyword)):
+                if not is_word_start(keyword, start):
+                    continue
+                for end in range(start + 1, len(keyword) + 1):
+                    fragments.setdefault(keyword[start:end], set()).update(dharma_indexes)
+        return {fragment: frozenset(indexes) for fragment, indexes in fragments.items()}
+    
+    def find_keywords(self, text):
+        """Return the ids of all keywords that occur in the text"""
+        return self.automaton.find(text)
+    
+    def hits_for_keywords(self, keyword_ids):
+        """Return per-dharma counts of a set of keyword ids"""
+        counts = [0] * len(self.dharma_types)
+        for keyword_id in keyword_ids:
+            for dharma_index in self.keyword_dharmas[keyword_id]:
+                counts[dharma_index] += 1
+        return counts
+    
+    def _dharmas_for_keywords(self, keyword_ids):
+        """Return the distinct dharma indexes listing any of the keywords"""
+        indexes = set()
+        for keyword_id in keyword_ids:
+            indexes.update(self.keyword_dharmas[keyword_id])
+        return indexes
+    
+    def word_dharmas(self, word):
+        """Return the dharma indexes whose keywords contain or are contained in a word"""
+        key = ("word", word)
+        result = self._lookup_cache.get(key)
+        if result is None:
+            indexes = self._dharmas_for_keywords(self.automaton.find(word))
+            indexes.update(self.fragments.get(word, ()))
+            result = self._remember(key, frozenset(indexes))
+        return result
+    
+    def phrase_dharmas(self, phrase):
+        """Return the dharma indexes with a keyword inside the phrase"""
+        key = ("phrase", phrase)
+        result = self._lookup_cache.get(key)
+        if result is None:
+            result = self._remember(key, frozenset(self._dharmas_for_keywords(self.automaton.find(phrase))))
+        return result
+    
+    def _remember(self, key, value):
+        """Store a lookup result, starting over once the cache is full"""
+        if len(self._lookup_cache) >= self.max_cached_lookups:
+            self._lookup_cache = {}
+        self._lookup_cache[key] = value
+        return value
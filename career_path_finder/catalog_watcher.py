@@ -0,0 +1,80 @@
+"""
+Catalog hot reloading for Career Path Finder
+"""
+
+import threading
+from rich.console import Console
+
+from .data_manager import DataManager
+from .metrics import increment, span
+
+# Initialize Rich console on stderr so reload notices do not mix with piped results
+console = Console(stderr=True)
+
+# Seconds between checks of the catalog files
+POLL_INTERVAL = 2.0
+
+class CatalogWatcher:
+    """Background thread that recompiles the catalog when its data files change and swaps it into an engine
+    
+    The dharma and guidance data files are polled by modification time and
+    size, which works on every platform and costs two stat calls. A change
+    is compiled on this thread, through the compiled cache so other
+    processes watching the same files reuse it, and handed to
+    ScoringEngine.swap_catalog. Profiles being scored meanwhile finish on
+    the previous catalog. Files that are missing or do not parse, as while
+    an editor is saving them, leave the current catalog in place.
+    """
+    
+    def __init__(self, engine, data_manager=None, interval=POLL_INTERVAL):
+        """Initialize the watcher; the files as they are now are taken to be the engine's catalog"""
+        self.engine = engine
+        self.data_manager = data_manager or DataManager()
+        self.interval = interval
+        self.signature = self.data_manager.source_signature()
+        self.thread = None
+        self._stopped = threading.Event()
+    
+    def start(self):
+        """Start polling on a daemon thread and return the watcher"""
+        self._stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        """Stop polling and wait for a reload in progress to finish"""
+        self._stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+    
+    def _run(self):
+        """Check the files every interval seconds until stopped"""
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                console.print(f"[yellow]Catalog watcher error: {str(e)}[/yellow]")
+    
+    def check(self):
+        """Reload the catalog if its files changed since the last check; returns whether it was swapped"""
+        # Read before loading so changes made during the reload are picked up by the next check
+        signature = self.data_manager.source_signature()
+        if signature is None or signature == self.signature:
+            return False
+        
+        self.signature = signature
+        try:
+            with span("catalog.reload"):
+                catalog = self.data_manager.load_compiled_catalog(fallback=False)
+                self.engine.swap_catalog(catalog)
+        except Exception as e:
+            # Retried when the files change again
+            console.print(f"[yellow]Keeping the current catalog; could not reload it: {str(e)}[/yellow]")
+            increment("catalog.reload_failures")
+            return False
+        
+        increment("catalog.reloads")
+        console.print(f"[green]Reloaded the dharma catalog ({len(catalog.dharma_types)} dharma types)[/green]")
+        return True
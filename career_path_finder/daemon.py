@@ -0,0 +1,315 @@
+"""
+Pre-forked local scoring daemon for Career Path Finder
+
+Protocol: one newline-terminated JSON request per Unix socket connection.
+    {"op": "ping"}                     -> {"result": {"pid": ..., "version": ...}}
+    {"op": "score", "profile": {...}}  -> {"stage": "analyze"}, ... then {"result": {...}}
+Failures are answered with {"error": "..."}.
+"""
+
+import os
+import json
+import signal
+import stat
+import time
+import socket
+import tempfile
+from rich.console import Console
+
+from . import __version__
+from .catalog_watcher import CatalogWatcher
+
+# Initialize Rich console
+console = Console()
+
+# Largest request accepted, in bytes
+MAX_REQUEST_SIZE = 10 * 1024 * 1024
+
+# Profile scored before forking so every lazily built index is shared by the workers
+WARMUP_PROFILE = {"passions": ["helping people learn new things"], "skills": ["teaching"], "dream_impact": "better schools"}
+
+# Seconds to wait before replacing a worker that failed, so a persistent failure does not spin
+RESPAWN_DELAY = 1.0
+
+# Signals that stop the daemon, blocked while a worker is forked
+STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+def default_socket_path():
+    """Return the daemon socket path: CAREER_FINDER_SOCKET, else a per-user socket in the runtime directory
+    
+    Without XDG_RUNTIME_DIR the socket goes in a per-user directory under
+    the temp directory, which the daemon creates with mode 0700.
+    """
+    if os.environ.get("CAREER_FINDER_SOCKET"):
+        return os.environ["CAREER_FINDER_SOCKET"]
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], f"career-path-finder-{user}.sock")
+    return os.path.join(tempfile.gettempdir(), f"career-path-finder-{user}", "daemon.sock")
+
+def check_socket_owner(path):
+    """Raise DaemonError unless path is a socket owned by the current user, so another user cannot pose as the daemon"""
+    try:
+        info = os.stat(path)
+    except OSError as e:
+        raise DaemonError(str(e))
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise DaemonError(f"{path} is not a socket owned by the current user")
+
+class DaemonError(Exception):
+    """The daemon could not be reached or could not answer a request"""
+
+class DaemonStopped(Exception):
+    """Raised in the daemon's main process when it is asked to stop"""
+
+class ScoringDaemon:
+    """Local daemon holding a warm NLP analyzer and catalog for CLI sessions
+    
+    The engine is built and exercised once, then worker processes are
+    forked; they share its memory copy-on-write and accept connections on
+    the same listening socket. Workers that die are replaced. With
+    watch_catalog, every worker reloads the catalog when its files change.
+    """
+    
+    def __init__(self, socket_path=None, workers=2, watch_catalog=False, **engine_options):
+        """Initialize the daemon; engine_options are passed to build_engine"""
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = max(1, workers)
+        self.watch_catalog = watch_catalog
+        self.engine_options = engine_options
+        self.engine = None
+        self.watcher = None
+        self.listener = None
+        self.children = set()
+    
+    def serve_forever(self):
+        """Warm the engine, fork the workers and supervise them until stopped"""
+        from .workers import build_engine
+        
+        if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+            raise DaemonError("The daemon needs Unix domain sockets and fork()")
+        
+        # Bind first so a second daemon fails before loading anything; clients fall back until workers accept
+        self.listener = self._listen()
+        previous_handlers = {signum: signal.signal(signum, self._stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            console.print("[cyan]Loading NLP model and dharma catalog...[/cyan]")
+            self.engine = build_engine(**self.engine_options)
+            self.engine.nlp_analyzer.nlp  # Load spaCy now rather than in every worker
+            self.engine.score(WARMUP_PROFILE)
+            # A SQLite connection must not be used across fork(), so each worker opens its own
+            if self.engine.nlp_analyzer.cache is not None:
+                self.engine.nlp_analyzer.cache.close()
+            if self.watch_catalog:
+                # Started in each worker, since threads do not survive fork; replaced workers catch up on their first check
+                self.watcher = CatalogWatcher(self.engine)
+            
+            for _ in range(self.workers):
+                self._spawn()
+            console.print(f"[green]Career Path Finder daemon listening on {self.socket_path} "
+                          f"with {self.workers} workers[/green]")
+            while True:
+                pid, status = os.wait()
+                if pid in self.children:
+                    self.children.discard(pid)
+                    console.print(f"[yellow]Worker {pid} exited; starting a new one[/yellow]")
+                    if status:
+                        time.sleep(RESPAWN_DELAY)
+                    self._spawn()
+        except DaemonStopped:
+            console.print("\n[yellow]Shutting down...[/yellow]")
+        finally:
+            # Ignore further signals until cleanup is done, or the socket file would be left behind
+            for signum in previous_handlers:
+                signal.signal(signum, signal.SIG_IGN)
+            try:
+                self._shutdown()
+            finally:
+                for signum, handler in previous_handlers.items():
+                    signal.signal(signum, handler)
+    
+    def _stop(self, signum, frame):
+        """Signal handler that ends the supervision loop, or a worker's accept loop"""
+        raise DaemonStopped()
+    
+    def _listen(self):
+        """Bind the listening socket, replacing a stale socket file left by a dead daemon"""
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            check_socket_owner(self.socket_path)
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+        
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the user running the daemon may connect
+        previous_umask = os.umask(0o177)
+        try:
+            listener.bind(self.socket_path)
+        finally:
+            os.umask(previous_umask)
+        listener.listen(64)
+        return listener
+    
+    def _spawn(self):
+        """Fork one worker process"""
+        # A stop signal arriving before the worker has its own handler would otherwise unwind into serve_forever
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            pid = os.fork()
+            if not pid:
+                self._run_worker()
+            self.children.add(pid)
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+    
+    def _run_worker(self):
+        """Accept connections in a forked worker until stopped; never returns"""
+        status = 0
+        cache = None
+        try:
+            # The main process handles Ctrl+C and stops workers with SIGTERM, which ends the accept loop
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+            cache = self.engine.nlp_analyzer.cache
+            if cache is not None:
+                cache.open()
+            # Start from the seed as if the warmup had not run; unseeded workers would otherwise repeat each other
+            self.engine.rng.seed(self.engine_options.get("seed"))
+            if self.watcher is not None:
+                self.watcher.start()
+            while True:
+                connection, _ = self.listener.accept()
+                try:
+                    self._handle(connection)
+                except OSError:
+                    pass  # The client went away before the answer was sent
+        except DaemonStopped:
+            pass
+        except BaseException as e:
+            console.print(f"[bold red]Worker {os.getpid()} failed: {str(e)}[/bold red]")
+            status = 1
+        finally:
+            # Never return into the main process's code, whatever happened above
+            try:
+                if cache is not None:
+                    cache.close()  # Write analyses not yet flushed
+            finally:
+                os._exit(status)
+    
+    def _handle(self, connection):
+        """Answer the single request on a connection"""
+        with connection, connection.makefile('rwb') as stream:
+            def send(message):
+                stream.write(json.dumps(message).encode("utf-8") + b"\n")
+                stream.flush()
+            
+            try:
+                line = stream.readline(MAX_REQUEST_SIZE + 1)
+                if len(line) > MAX_REQUEST_SIZE:
+                    send({"error": "Request too large"})
+                    return
+                request = json.loads(line.decode("utf-8"))
+                operation = request.get("op") if isinstance(request, dict) else None
+                if operation == "ping":
+                    send({"result": {"pid": os.getpid(), "version": __version__}})
+                elif operation == "score":
+                    profile = request.get("profile")
+                    if not isinstance(profile, dict):
+                        send({"error": "profile must be a JSON object"})
+                        return
+                    results = self.engine.score(profile, progress=lambda stage: send({"stage": stage}))
+                    send({"result": results.to_dict()})
+                else:
+                    send({"error": f"Unknown op {operation!r}"})
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                send({"error": f"Invalid JSON: {str(e)}"})
+            except OSError:
+                raise
+            except Exception as e:
+                send({"error": str(e)})
+    
+    def _shutdown(self):
+        """Stop the workers and remove the socket"""
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self.children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.children.clear()
+        if self.listener is not None:
+            self.listener.close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+class DaemonClient:
+    """Scores profiles on a running daemon; a drop-in for IncrementalAnalyzer in CareerFinder"""
+    
+    def __init__(self, socket_path=None, timeout=60):
+        """Initialize the client; each request opens its own connection"""
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+    
+    def request(self, message, on_stage=None, timeout=None):
+        """Send a request and return its result; stage events are passed to on_stage"""
+        try:
+            check_socket_owner(self.socket_path)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(timeout or self.timeout)
+                connection.connect(self.socket_path)
+                with connection.makefile('rwb') as stream:
+                    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+                    stream.flush()
+                    for line in stream:
+                        reply = json.loads(line.decode("utf-8"))
+                        if "stage" in reply:
+                            if on_stage:
+                                on_stage(reply["stage"])
+                        elif "error" in reply:
+                            raise DaemonError(reply["error"])
+                        else:
+                            return reply["result"]
+        except (OSError, ValueError, KeyError) as e:
+            raise DaemonError(str(e))
+        raise DaemonError("The daemon closed the connection without answering")
+    
+    def ping(self, timeout=None):
+        """Return the daemon's pid and version"""
+        return self.request({"op": "ping"}, timeout=timeout)
+    
+    def submit(self, field, index, text):
+        """Accept an answer; the daemon analyzes the whole profile at once, which is fast while warm"""
+    
+    def finish(self, user_data, progress=None):
+        """Score the profile on the daemon and return the results as a plain dict"""
+        return self.request({"op": "score", "profile": user_data}, on_stage=progress)
+    
+    def close(self):
+        """Nothing to release; connections last one request"""
+
+def connect_daemon(socket_path=None, timeout=0.5):
+    """Return a DaemonClient if a daemon of this version answers on the socket, else None"""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    client = DaemonClient(socket_path)
+    try:
+        info = client.ping(timeout=timeout)
+    except DaemonError:
+        return None
+    return client if info.get("version") == __version__ else None
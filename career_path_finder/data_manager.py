@@ -4,26 +4,50 @@ Data management functionality for Career Path Finder
 
 import os
 import json
+import mmap
+import pickle
+import hashlib
+import tempfile
 from pathlib import Path
 from rich.console import Console
 
-# Initialize Rich console
-console = Console()
+from .catalog import CompiledCatalog, CATALOG_FORMAT_VERSION
+from .metrics import increment, timed
+from .results_store import ResultsStore
+
+# Initialize Rich console on stderr so warnings do not mix with piped results
+console = Console(stderr=True)
+
+def trusted_file(info):
+    """Whether a file, given its os.stat result, is owned by this user or root and writable by no one else"""
+    if not hasattr(os, "getuid"):
+        return True
+    return info.st_uid in (os.getuid(), 0) and not info.st_mode & 0o022
 
 class DataManager:
     """Class for managing dharma data"""
     
-    def __init__(self):
-        """Initialize the data manager"""
+    def __init__(self, dharma_data_path=None):
+        """Initialize the data manager, optionally with a different catalog file"""
         self.data_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-        self.dharma_data_path = self.data_dir.parent / "data" / "dharma_data.json"
+        if dharma_data_path is None:
+            self.dharma_data_path = self.data_dir.parent / "data" / "dharma_data.json"
+        else:
+            self.dharma_data_path = Path(dharma_data_path)
+        self.guidance_data_path = self.dharma_data_path.with_name("career_guidance.json")
+        self.compiled_cache_path = self.dharma_data_path.with_suffix(".cache")
+        self.results_db_path = Path(os.environ.get("CAREER_FINDER_RESULTS_DB") or
+                                    self.dharma_data_path.parent / "results.db")
+        self.learned_weights_path = Path(os.environ.get("CAREER_FINDER_WEIGHTS") or
+                                         self.dharma_data_path.parent / "learned_weights.npz")
     
+    @timed("data.load_dharma_data")
     def load_dharma_data(self):
         """Load dharma paths data or create default if not exists"""
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.dharma_data_path), exist_ok=True)
-        
         if not self.dharma_data_path.exists():
+            # Ensure data directory exists
+            os.makedirs(os.path.dirname(self.dharma_data_path), exist_ok=True)
+            
             # Create default dharma data
             default_data = self._get_default_dharma_data()
             
@@ -37,19 +61,130 @@ class DataManager:
             try:
                 with open(self.dharma_data_path, 'r') as f:
                     return json.load(f)
-            except json.JSONDecodeError:
-                console.print("[bold red]Error loading dharma data. Using default data.[/bold red]")
+            except json.JSONDecodeError as e:
+                console.print(f"[bold red]Error loading dharma data ({str(e)}). Using default data.[/bold red]")
                 return self._get_default_dharma_data()
     
-    def save_results(self, filename, data):
-        """Save results to a file"""
+    @timed("data.load_guidance_data")
+    def load_guidance_data(self):
+        """Load the messages, alignment explanations and skill rules, creating the defaults if missing"""
+        if not self.guidance_data_path.exists():
+            os.makedirs(os.path.dirname(self.guidance_data_path), exist_ok=True)
+            default_data = self._get_default_guidance_data()
+            with open(self.guidance_data_path, 'w') as f:
+                json.dump(default_data, f, indent=4)
+            return default_data
+        try:
+            with open(self.guidance_data_path, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            console.print(f"[bold red]Error loading guidance data ({str(e)}). Using default data.[/bold red]")
+            return self._get_default_guidance_data()
+    
+    def source_signature(self):
+        """Return the (mtime_ns, size) of the dharma and guidance data files, or None if either is missing"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4)
-            return True
-        except Exception as e:
-            console.print(f"[bold red]Error saving results: {str(e)}[/bold red]")
-            return False
+            return tuple((stat.st_mtime_ns, stat.st_size)
+                         for stat in (self.dharma_data_path.stat(), self.guidance_data_path.stat()))
+        except OSError:
+            return None
+    
+    @timed("data.load_compiled_catalog")
+    def load_compiled_catalog(self, fallback=True):
+        """Load the compiled catalog from its on-disk cache, rebuilding it when the JSON changes
+        
+        The catalog is compiled from the dharma data and the guidance data
+        together. The cache is reused while both files' mtime and size are
+        unchanged. If they changed but the content hash did not, only the
+        cache header is refreshed. The cache is read through mmap so concurrent workers share
+        the page cache instead of each reading the file. Unreadable data
+        falls back to the default catalog, or raises ValueError without fallback.
+        """
+        try:
+            stat = self.dharma_data_path.stat()
+        except OSError:
+            # First run: create the data file, then compile it
+            self.load_dharma_data()
+            stat = self.dharma_data_path.stat()
+        if not self.guidance_data_path.exists():
+            self.load_guidance_data()
+        guidance_stat = self.guidance_data_path.stat()
+        
+        header, catalog = self._read_compiled_cache()
+        if (catalog is not None and header.get("mtime_ns") == stat.st_mtime_ns and header.get("size") == stat.st_size
+                and header.get("guidance") == [guidance_stat.st_mtime_ns, guidance_stat.st_size]):
+            increment("data.compiled_cache_hits")
+            return catalog
+        
+        with open(self.dharma_data_path, 'rb') as f:
+            source = f.read()
+        with open(self.guidance_data_path, 'rb') as f:
+            guidance_source = f.read()
+        digest = hashlib.sha256(source + b"\0" + guidance_source).hexdigest()
+        
+        if catalog is None or header.get("sha256") != digest:
+            try:
+                dharma_paths = json.loads(source.decode("utf-8"))
+                guidance = json.loads(guidance_source.decode("utf-8"))
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                if not fallback:
+                    raise
+                # Do not cache the fallback so the files are retried once fixed
+                console.print(f"[bold red]Error loading dharma data ({str(e)}). Using default data.[/bold red]")
+                return CompiledCatalog(self._get_default_dharma_data(), self._get_default_guidance_data()).precompute()
+            catalog = CompiledCatalog(dharma_paths, guidance).precompute()
+            increment("data.compiled_cache_rebuilds")
+        
+        self._write_compiled_cache({
+            "format": CATALOG_FORMAT_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "guidance": [guidance_stat.st_mtime_ns, guidance_stat.st_size],
+            "sha256": digest
+        }, catalog)
+        return catalog
+    
+    def _read_compiled_cache(self):
+        """Return (header, catalog) from the compiled cache, or ({}, None) if it is missing or stale"""
+        try:
+            with open(self.compiled_cache_path, 'rb') as f:
+                if not trusted_file(os.fstat(f.fileno())):
+                    # Unpickling runs code, so only a file no other user could have written is loaded
+                    console.print(f"[yellow]Ignoring compiled catalog cache {self.compiled_cache_path}: "
+                                  f"it is writable by or owned by another user[/yellow]")
+                    return {}, None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    header_end = data.find(b"\n")
+                    header = json.loads(data[:header_end].decode("utf-8"))
+                    if header.get("format") != CATALOG_FORMAT_VERSION:
+                        return {}, None
+                    data.seek(header_end + 1)
+                    return header, pickle.load(data)
+        except Exception:
+            # Missing, truncated or incompatible caches are simply rebuilt
+            return {}, None
+    
+    def _write_compiled_cache(self, header, catalog):
+        """Atomically replace the compiled cache; failures only cost the next load a rebuild"""
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=str(self.compiled_cache_path.parent), suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json.dumps(header).encode("utf-8") + b"\n")
+                    pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.chmod(temp_path, 0o644)  # Readable by workers running as other users
+                os.replace(temp_path, self.compiled_cache_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            console.print(f"[yellow]Could not write compiled catalog cache: {str(e)}[/yellow]")
+    
+    def open_results_store(self, db_path=None):
+        """Open the results store, by default data/results.db or CAREER_FINDER_RESULTS_DB"""
+        db_path = Path(db_path) if db_path else self.results_db_path
+        os.makedirs(db_path.parent, exist_ok=True)
+        return ResultsStore(db_path)
     
     def _get_default_dharma_data(self):
         """Return default dharma data"""
@@ -151,3 +286,138 @@ class DataManager:
                 ]
             }
         }
+    
+    def _get_default_guidance_data(self):
+        """Return default personalized messages, alignment explanations and skill rules
+        
+        alignment_explanations are keyed by career title; careers without an
+        entry use generic_alignments. A career's suggested skills come from
+        the first skill rule with a title_contains fragment in its title, or
+        else from the first keyword_skill_count keywords of its dharma type.
+        """
+        return {
+            "personalized_messages": {
+                "helping_others_grow": [
+                    "You have a natural gift for bringing out the best in others.",
+                    "Your ability to see potential in people is remarkable.",
+                    "You find joy in witnessing others' growth and development.",
+                    "Teaching and mentoring seem to come naturally to you."
+                ],
+                "creating_and_innovating": [
+                    "You have a natural drive to bring new ideas into reality.",
+                    "Your creative energy is a powerful force that seeks expression.",
+                    "You see possibilities where others see limitations.",
+                    "Building and creating seems to be in your DNA."
+                ],
+                "solving_problems": [
+                    "You have a natural talent for finding solutions to complex challenges.",
+                    "Your analytical mind thrives when tackling difficult problems.",
+                    "You see obstacles as puzzles waiting to be solved.",
+                    "Finding better ways to do things energizes you."
+                ],
+                "caring_for_others": [
+                    "Your compassionate nature is a gift to those around you.",
+                    "You have a natural ability to sense others' needs and respond with care.",
+                    "Supporting others through difficult times gives you a sense of purpose.",
+                    "Your empathy allows you to connect deeply with others."
+                ],
+                "organizing_and_planning": [
+                    "Your ability to create order from chaos is remarkable.",
+                    "Your talent for seeing the big picture while managing details is a rare gift.",
+                    "You find satisfaction in systems that run smoothly and efficiently.",
+                    "Planning and coordinating seem to come naturally to you."
+                ],
+                "expressing_creativity": [
+                    "Your creative spirit seeks outlets for expression.",
+                    "You see the world through a unique lens that others benefit from.",
+                    "Bringing beauty and meaning into the world drives you.",
+                    "Your imagination is a powerful tool for innovation."
+                ],
+                "discovering_knowledge": [
+                    "Your curious mind constantly seeks deeper understanding.",
+                    "You find joy in the pursuit of knowledge and insight.",
+                    "Learning and sharing wisdom seems central to who you are.",
+                    "Your analytical nature helps you uncover hidden truths."
+                ],
+                "leading_and_inspiring": [
+                    "You have a natural ability to inspire others toward a shared vision.",
+                    "Your leadership qualities draw people to follow your guidance.",
+                    "You see potential in groups that others might miss.",
+                    "Bringing people together for a common purpose energizes you."
+                ]
+            },
+            "alignment_explanations": {
+                "Teacher/Professor": [
+                    "This role lets you directly shape minds and witness the 'aha' moments when students grasp new concepts.",
+                    "As an educator, you'll guide others through their learning journey, helping them discover their own potential.",
+                    "Teaching allows you to create transformative learning experiences that change how people see themselves and the world."
+                ],
+                "Corporate Trainer": [
+                    "As a trainer in industry, you'll help professionals develop skills that transform their careers and confidence.",
+                    "This role lets you combine technical expertise with your passion for developing others' potential.",
+                    "You'll design learning experiences that help professionals overcome challenges and reach new heights."
+                ],
+                "Coach": [
+                    "Coaching allows you to walk alongside others as they navigate their personal and professional growth.",
+                    "This role lets you ask powerful questions that help others discover their own answers and potential.",
+                    "As a coach, you'll create a safe space for transformation and breakthrough moments."
+                ],
+                "Software Developer": [
+                    "This role allows you to create solutions that solve real problems and improve people's lives.",
+                    "As a developer, you'll build digital experiences that transform how people work and connect.",
+                    "This path lets you express your creativity through code, bringing new possibilities into existence."
+                ],
+                "Product Designer": [
+                    "Design work allows you to shape how people experience and interact with the world around them.",
+                    "This role lets you solve human problems through thoughtful, creative design solutions.",
+                    "As a designer, you'll create products that seamlessly blend form and function to enhance lives."
+                ],
+                "Consultant": [
+                    "Consulting lets you tackle a variety of complex problems across different organizations and industries.",
+                    "This role allows you to analyze situations from multiple angles and develop innovative solutions.",
+                    "As a consultant, you'll help organizations overcome their biggest challenges and reach their potential."
+                ],
+                "Engineer": [
+                    "Engineering allows you to apply scientific principles to create solutions to real-world problems.",
+                    "This role lets you design and build systems that improve efficiency, safety, or quality of life.",
+                    "As an engineer, you'll solve complex technical challenges that others might find overwhelming."
+                ],
+                "Healthcare Professional": [
+                    "This path allows you to provide care and comfort to people during their most vulnerable moments.",
+                    "As a healthcare provider, you'll make a direct impact on people's wellbeing and quality of life.",
+                    "This role lets you combine technical expertise with deep compassion to heal and support others."
+                ],
+                "Project Manager": [
+                    "This role lets you orchestrate complex initiatives, bringing order to multifaceted challenges.",
+                    "As a project manager, you'll guide teams through uncertainty toward successful outcomes.",
+                    "This path allows you to create systems and processes that make ambitious goals achievable."
+                ],
+                "Graphic Designer": [
+                    "This role allows you to communicate powerful messages through visual storytelling.",
+                    "As a designer, you'll create work that evokes emotion and inspires action.",
+                    "This path lets you transform abstract concepts into tangible visual experiences."
+                ],
+                "Researcher": [
+                    "Research allows you to push the boundaries of what's known and discover new insights.",
+                    "This role lets you dive deep into questions that fascinate you and share your findings with the world.",
+                    "As a researcher, you'll contribute to humanity's collective knowledge and understanding."
+                ],
+                "Team Leader/Manager": [
+                    "This role lets you build and nurture teams that accomplish more together than individuals could alone.",
+                    "As a leader, you'll help team members develop their strengths and navigate challenges.",
+                    "This path allows you to create environments where people feel empowered to do their best work."
+                ]
+            },
+            "generic_alignments": [
+                "This role allows you to express your dharma by creating value through your natural gifts and inclinations.",
+                "This path provides a platform where your unique strengths can make a meaningful difference.",
+                "In this role, you can align your work with your deeper purpose, bringing fulfillment beyond just earning a living."
+            ],
+            "skill_rules": [
+                {"title_contains": ["Teacher", "Trainer"], "skills": ["communication", "curriculum development", "presentation skills"]},
+                {"title_contains": ["Developer"], "skills": ["programming", "problem-solving", "technical design"]},
+                {"title_contains": ["Designer"], "skills": ["visual design", "user research", "creative thinking"]},
+                {"title_contains": ["Manager", "Leader"], "skills": ["leadership", "team management", "strategic planning"]}
+            ],
+            "keyword_skill_count": 3
+        }
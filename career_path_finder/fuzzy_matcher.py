@@ -0,0 +1,219 @@
+"""
+Fuzzy skill matching for Career Path Finder
+"""
+
+import re
+import bisect
+
+# Use the C implementation of edit distance when python-Levenshtein is installed
+try:
+    from Levenshtein import distance as edit_distance
+except ImportError:
+    def edit_distance(a, b):
+        """Levenshtein distance between two strings"""
+        if len(a) < len(b):
+            a, b = b, a
+        previous = list(range(len(b) + 1))
+        for i, char_a in enumerate(a, 1):
+            current = [i]
+            for j, char_b in enumerate(b, 1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+            previous = current
+        return previous[-1]
+
+# Reduce inflected words to a common stem so "mentoring" meets "mentor"; NLTK is imported on first use
+_stemmer = None
+
+def _stem(word):
+    """Return the Porter stem of a word, or the word itself without NLTK"""
+    global _stemmer
+    if _stemmer is None:
+        try:
+            from nltk.stem import PorterStemmer
+            _stemmer = PorterStemmer().stem
+        except ImportError:
+            _stemmer = str
+    return _stemmer(word)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Split text into lowercased stemmed tokens"""
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+# Common abbreviations in skills, replaced by the words they stand for before matching
+KNOWN_ABBREVIATIONS = {
+    "sw": "software", "dev": "developer", "devs": "developers", "eng": "engineer", "mgmt": "management",
+    "mgr": "manager", "admin": "administrative", "ops": "operations", "hr": "human resources",
+    "it": "information technology", "qa": "quality assurance", "ux": "user experience", "ui": "user interface",
+    "biz": "business", "mktg": "marketing", "edu": "education", "comms": "communication", "psych": "psychology",
+    "tech": "technical", "sci": "science", "info": "information", "ml": "machine learning",
+    "ai": "artificial intelligence",
+}
+
+# Shortest token matched by typos or as a prefix; shorter words are too easily other words ("read", "lead")
+MIN_FUZZY_LENGTH = 4
+
+def max_typos(term):
+    """Number of edits tolerated for a token of this length"""
+    if len(term) <= MIN_FUZZY_LENGTH:
+        return 0
+    elif len(term) <= 7:
+        return 1
+    else:
+        return 2
+
+def is_typo(token, term, distance):
+    """Whether a term within the edit distance is a plausible misspelling of the token
+    
+    Below eight letters a changed letter mostly makes a different word
+    ("project", "protect"), so only a missing or extra letter, or a
+    different last letter ("analysi", "analyst"), counts as a typo.
+    """
+    if distance == 0 or len(token) >= 8 or len(term) != len(token):
+        return True
+    return token[:-1] == term[:-1]
+
+def is_prefix(token, term):
+    """Whether the token is a prefix covering most of the term ("manag" for "manager", not "car" for "care")"""
+    return len(token) >= MIN_FUZZY_LENGTH and term.startswith(token) and 3 * len(token) >= 2 * len(term)
+
+class BKTree:
+    """Burkhard-Keller tree for finding terms within an edit distance"""
+    
+    def __init__(self, terms=()):
+        """Build the tree from an iterable of terms"""
+        self.root = None
+        for term in terms:
+            self.add(term)
+    
+    def add(self, term):
+        """Add a term to the tree"""
+        if self.root is None:
+            self.root = (term, {})
+            return
+        node_term, children = self.root
+        while True:
+            distance = edit_distance(term, node_term)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (term, {})
+                return
+            node_term, children = child
+    
+    def search(self, term, max_distance):
+        """Return (distance, term) pairs within max_distance of term"""
+        if self.root is None:
+            return []
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_term, children = stack.pop()
+            distance = edit_distance(term, node_term)
+            if distance <= max_distance:
+                matches.append((distance, node_term))
+            # Triangle inequality: only subtrees in this band can hold matches
+            for child_distance in range(distance - max_distance, distance + max_distance + 1):
+                child = children.get(child_distance)
+                if child is not None:
+                    stack.append(child)
+        return matches
+
+class FuzzySkillMatcher:
+    """Index over career titles and dharma keywords for typo-tolerant skill matching
+    
+    Each skill token is matched against the indexed terms by edit distance
+    (through a BK-tree) and by prefix, both only for tokens long enough not
+    to be other words. Known abbreviations ("sw dev") are expanded first,
+    and a token spelling the initials of a multi-word title ("pm") matches
+    that title. A keyword or title matches when all of its tokens do.
+    """
+    
+    # Upper bound on memoized skill lookups
+    max_cached_skills = 65536
+    
+    def __init__(self, catalog):
+        """Build the term index for a compiled catalog"""
+        self.catalog = catalog
+        self._patterns = []  # (token tuple, ("keyword", id) or ("career", dharma index, career index))
+        term_patterns = {}
+        self._initials = {}  # Initials of multi-word title alternatives -> career keys
+        
+        for keyword_id, keyword in enumerate(catalog.keywords):
+            self._add_pattern(tokenize(keyword), ("keyword", keyword_id), term_patterns)
+        
+        for dharma_index, data in enumerate(catalog.dharma_paths.values()):
+            for career_index, career in enumerate(data["careers"]):
+                # "Teacher/Professor" matches either alternative
+                for alternative in career["title"].split("/"):
+                    self._add_pattern(tokenize(alternative), ("career", dharma_index, career_index), term_patterns)
+                    words = TOKEN_PATTERN.findall(alternative.lower())
+                    if len(words) >= 2:
+                        initials = "".join(word[0] for word in words)
+                        self._initials.setdefault(initials, set()).add((dharma_index, career_index))
+        
+        self._term_patterns = {term: tuple(indexes) for term, indexes in term_patterns.items()}
+        self._sorted_terms = sorted(self._term_patterns)
+        self._tree = BKTree(self._sorted_terms)
+        self._cache = {}
+    
+    def _add_pattern(self, tokens, target, term_patterns):
+        """Register a keyword or title alternative under each of its tokens"""
+        if not tokens:
+            return
+        pattern_index = len(self._patterns)
+        self._patterns.append((frozenset(tokens), target))
+        for token in tokens:
+            term_patterns.setdefault(token, []).append(pattern_index)
+    
+    def _matching_terms(self, token):
+        """Return the indexed terms a single skill token can stand for"""
+        terms = {term for distance, term in self._tree.search(token, max_typos(token)) if is_typo(token, term, distance)}
+        
+        if len(token) >= MIN_FUZZY_LENGTH:
+            # Terms the token is a prefix of sort directly after it
+            position = bisect.bisect_left(self._sorted_terms, token)
+            while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(token):
+                if is_prefix(token, self._sorted_terms[position]):
+                    terms.add(self._sorted_terms[position])
+                position += 1
+        return terms
+    
+    def match(self, skill):
+        """Return (keyword ids, career keys) that a skill fuzzily matches
+        
+        Career keys are (dharma index, career index) pairs.
+        """
+        result = self._cache.get(skill)
+        if result is not None:
+            return result
+        
+        keyword_ids = set()
+        career_keys = set()
+        matched_terms = set()
+        for word in TOKEN_PATTERN.findall(skill.lower()):
+            tokens = [_stem(word)]
+            if word in KNOWN_ABBREVIATIONS:
+                # "sw" is software rather than the initials of Social Worker
+                tokens.extend(tokenize(KNOWN_ABBREVIATIONS[word]))
+            else:
+                career_keys.update(self._initials.get(word, ()))
+            for token in tokens:
+                matched_terms.update(self._matching_terms(token))
+        
+        candidates = {index for term in matched_terms for index in self._term_patterns[term]}
+        for pattern_index in candidates:
+            tokens, target = self._patterns[pattern_index]
+            if tokens <= matched_terms:
+                if target[0] == "keyword":
+                    keyword_ids.add(target[1])
+                else:
+                    career_keys.add(target[1:])
+        
+        result = (frozenset(keyword_ids), frozenset(career_keys))
+        if len(self._cache) >= self.max_cached_skills:
+            self._cache = {}
+        self._cache[skill] = result
+        return result
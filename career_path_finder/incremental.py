@@ -0,0 +1,130 @@
+"""
+Incremental background analysis for Career Path Finder
+"""
+
+import queue
+import threading
+from rich.console import Console
+
+from .metrics import increment, span, timed
+from .nlp_analyzer import merge_terms, summarize_terms
+from .scoring_engine import ANSWER_FIELDS, combine_inputs, field_values, validate_profile
+
+# Initialize Rich console
+console = Console()
+
+class IncrementalAnalyzer:
+    """Class for analyzing answers on a background thread while the user is still answering
+    
+    Each answer's word counts, phrases and (for scorers that support it)
+    keyword matches are kept separately and merged in answer order when the
+    results are needed, so only the last answer can still be pending then.
+    spaCy's noun chunks and lemmas depend on the surrounding text, so with a
+    spaCy model the answers so far are parsed together through the analysis
+    cache instead, and finish() reads the parse of all of them from it.
+    Either way the analysis matches ScoringEngine.score; only keywords
+    spanning two answers are not matched.
+    """
+    
+    def __init__(self, engine):
+        """Initialize the analyzer and start its background thread"""
+        self.engine = engine
+        self.partials = {}
+        # Submitted answers by field and index, joined as combine_inputs would for spaCy
+        self.submitted = {}
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="incremental-analyzer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, field, index, text):
+        """Queue one answer for analysis; index is its position within the field"""
+        if text and text.strip():
+            self.queue.put((field, index, text))
+    
+    def _run(self):
+        """Analyze queued answers until close() is called"""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                field, index, text = item
+                self.partials[(field, index)] = self._analyze_answer(text)
+                if self.engine.nlp_analyzer.spacy_available:
+                    answers = self.submitted.setdefault(field, {})
+                    answers[index] = text
+                    # Warm the cache; once the last answer is in, finish() finds its whole parse there
+                    self.engine.nlp_analyzer.analyze_text(combine_inputs(
+                        {name: [values[position] for position in sorted(values)] for name, values in self.submitted.items()}))
+            except Exception as e:
+                # finish() analyzes the answer again in the foreground
+                console.print(f"[yellow]Background analysis failed: {str(e)}[/yellow]")
+            finally:
+                self.queue.task_done()
+    
+    @timed("incremental.answer")
+    def _analyze_answer(self, text, scorer=None):
+        """Extract the terms and the scorer's partial result of one answer, noting the scorer used
+        
+        The terms are None with spaCy, whose analysis covers all answers at once.
+        """
+        text = text.lower()
+        scorer = scorer or self.engine.scorer
+        partial = scorer.partial(text) if scorer.supports_partial else None
+        analyzer = self.engine.nlp_analyzer
+        terms = None if analyzer.spacy_available else analyzer.extract_terms(text)
+        return text, terms, partial, scorer
+    
+    def _answers(self, user_data):
+        """List (field, index, text) for every free-text answer, in combine_inputs order"""
+        answers = []
+        for field in ANSWER_FIELDS:
+            for index, text in enumerate(field_values(user_data, field)):
+                if text and text.strip():
+                    answers.append((field, index, text))
+        return answers
+    
+    @timed("incremental.finish")
+    def finish(self, user_data, progress=None):
+        """Merge the analyzed answers and return the same results as ScoringEngine.score
+        
+        progress is called with each stage name from SCORE_STAGES, as in
+        ScoringEngine.score.
+        """
+        validate_profile(user_data)
+        with span("incremental.wait"):
+            self.queue.join()
+        
+        catalog, scorer = self.engine.snapshot()
+        answers = []
+        for field, index, text in self._answers(user_data):
+            partial = self.partials.get((field, index))
+            if partial is None or partial[0] != text.lower() or partial[3] is not scorer:
+                # Missed, edited since it was submitted, or analyzed before the catalog was swapped
+                increment("incremental.foreground_answers")
+                partial = self._analyze_answer(text, scorer)
+            answers.append(partial)
+        
+        if self.engine.nlp_analyzer.spacy_available:
+            nlp_results = self.engine.nlp_analyzer.analyze_text(combine_inputs(user_data))
+        else:
+            nlp_results = summarize_terms(merge_terms(terms for _, terms, _, _ in answers))
+        if progress:
+            progress("analyze")
+        
+        if scorer.supports_partial:
+            dharma_scores = scorer.complete([partial for _, _, partial, _ in answers], nlp_results)
+        else:
+            dharma_scores = scorer.score(" ".join(text for text, _, _, _ in answers), nlp_results)
+        if progress:
+            progress("score")
+        
+        results = self.engine.build_results(user_data, nlp_results, dharma_scores, catalog=catalog)
+        if progress:
+            progress("suggest")
+        return results
+    
+    def close(self):
+        """Stop the background thread once queued answers are done"""
+        self.queue.put(None)
+        self.thread.join()
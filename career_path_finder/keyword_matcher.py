@@ -0,0 +1,77 @@
+"""
+Multi-pattern keyword matching for Career Path Finder
+"""
+
+from collections import deque
+
+def is_word_start(text, index):
+    """Return True if a match starting at index begins a new word"""
+    return index == 0 or not text[index - 1].isalnum()
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every keyword in a text in a single pass
+    
+    Matches must start at a word boundary so that "care" does not fire inside
+    "scared". A match may end inside a word, which lets "teach" hit
+    "teaching" and "teacher".
+    """
+    
+    def __init__(self, patterns):
+        """Compile the automaton for the given patterns"""
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        
+        for index, pattern in enumerate(self.patterns):
+            if pattern:
+                self._add_pattern(pattern, index)
+        self._build_failure_links()
+    
+    def _add_pattern(self, pattern, index):
+        """Add a pattern to the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (index,)
+    
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] = self._output[next_state] + self._output[fail]
+    
+    def iter_matches(self, text):
+        """Yield (start, end, pattern index) for every match in the text"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                end = position + 1
+                start = end - len(self.patterns[index])
+                if is_word_start(text, start):
+                    yield start, end, index
+    
+    def find(self, text):
+        """Return the set of pattern indexes that occur in the text"""
+        return {index for _, _, index in self.iter_matches(text)}
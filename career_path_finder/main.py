@@ -3,11 +3,309 @@
 Main entry point for the Career Path Finder application
 """
 
-from .career_finder import CareerFinder
+import sys
+import argparse
 
-def main():
+# Scoring backends selectable on the command line
+SCORER_NAMES = ("heuristic", "matrix", "learned", "tfidf")
+
+def non_negative_int(value):
+    """Parse a command line integer that may not be negative"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+def positive_int(value):
+    """Parse a command line integer that must be 1 or more"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, got {number}")
+    return number
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog="career-path-finder",
+        description="Discover your true calling (dharma) and find career paths where you can express it"
+    )
+    parser.add_argument("--trace-json", default=None, help="Write a JSON trace of every instrumented stage when the run ends")
+    parser.add_argument("--metrics-file", default=None, help="Write stage timings and counters in Prometheus text format when the run ends")
+    parser.add_argument("--pacing", choices=("interactive", "none"), default=None, help="Pauses between screens of the interactive session (default: none unless run at a terminal)")
+    parser.add_argument("--no-daemon", dest="use_daemon", action="store_false", help="Analyze in this process even if a daemon is running")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch_parser = subparsers.add_parser("batch", help="Score pre-collected profiles from a JSONL file")
+    batch_parser.add_argument("input", help="JSONL file with one profile per line")
+    batch_parser.add_argument("output", help="JSONL file to write one result per line to")
+    batch_parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible explanations")
+    batch_parser.add_argument("--batch-size", type=int, default=64, help="Number of texts analyzed per batch")
+    batch_parser.add_argument("--n-process", type=int, default=1, help="Worker processes for text analysis (-1 for all cores)")
+    batch_parser.add_argument("--spacy-model", default=None, help="spaCy pipeline to use, or 'none' for the simple analyzer")
+    batch_parser.add_argument("--scorer", choices=SCORER_NAMES, default="heuristic", help="Dharma scoring backend")
+    batch_parser.add_argument("--cache-db", default=None, help="SQLite file caching text analysis across runs")
+    batch_parser.add_argument("--top-careers", type=positive_int, default=None, help="Suggest the K most relevant careers across the catalog instead of every career of the top callings")
+    batch_parser.add_argument("--results-db", default=None, help="Also record every result in this results store (SQLite)")
+    batch_parser.add_argument("--no-fuzzy-skills", dest="fuzzy_skills", action="store_false", help="Only count skills that contain a keyword or career title exactly")
+    
+    stream_parser = subparsers.add_parser("stream", help="Score JSON line profiles from stdin and write results to stdout as they finish")
+    stream_parser.add_argument("--workers", type=non_negative_int, default=None, help="Scoring worker processes (default: one per core, 0 to score in this process)")
+    stream_parser.add_argument("--window", type=int, default=None, help="Most chunks being scored at once (default: two per worker)")
+    stream_parser.add_argument("--chunk-size", type=int, default=32, help="Profiles sent to a worker at a time")
+    stream_parser.add_argument("--unordered", dest="ordered", action="store_false", help="Write results as chunks finish instead of in input order")
+    stream_parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible explanations (reproducible with --workers 0)")
+    stream_parser.add_argument("--spacy-model", default=None, help="spaCy pipeline to use, or 'none' for the simple analyzer")
+    stream_parser.add_argument("--scorer", choices=SCORER_NAMES, default="heuristic", help="Dharma scoring backend")
+    stream_parser.add_argument("--cache-db", default=None, help="SQLite file caching text analysis, shared by the workers")
+    stream_parser.add_argument("--top-careers", type=positive_int, default=None, help="Suggest the K most relevant careers across the catalog instead of every career of the top callings")
+    stream_parser.add_argument("--no-fuzzy-skills", dest="fuzzy_skills", action="store_false", help="Only count skills that contain a keyword or career title exactly")
+    stream_parser.add_argument("--watch-catalog", action="store_true", help="Reload the dharma catalog when its data files change")
+    
+    results_parser = subparsers.add_parser("results", help="Look up saved results")
+    lookup = results_parser.add_mutually_exclusive_group()
+    lookup.add_argument("--name", default=None, help="Results saved under this name")
+    lookup.add_argument("--calling", default=None, help="Results whose top calling is this dharma type")
+    results_parser.add_argument("--limit", type=int, default=10, help="Most results to show, newest first")
+    results_parser.add_argument("--db", default=None, help="Results store to read (default: data/results.db)")
+    
+    compare_parser = subparsers.add_parser("compare", help="Compare scoring backends on the same profiles")
+    compare_parser.add_argument("input", help="JSONL file with one profile per line")
+    compare_parser.add_argument("--scorers", nargs="+", choices=SCORER_NAMES, default=["heuristic", "matrix", "tfidf"], help="Backends to compare; the first is the reference ('learned' needs trained weights)")
+    compare_parser.add_argument("--batch-size", type=int, default=64, help="Number of texts analyzed per batch")
+    compare_parser.add_argument("--n-process", type=int, default=1, help="Worker processes for text analysis (-1 for all cores)")
+    compare_parser.add_argument("--spacy-model", default=None, help="spaCy pipeline to use, or 'none' for the simple analyzer")
+    
+    generate_parser = subparsers.add_parser("generate", help="Generate synthetic profiles or catalogs for load testing")
+    generate_parser.add_argument("kind", choices=("profiles", "catalog"), help="What to generate")
+    generate_parser.add_argument("output", help="JSONL file for profiles, JSON file for a catalog")
+    generate_parser.add_argument("--count", type=int, default=1000, help="Number of profiles")
+    generate_parser.add_argument("--catalog", default=None, help="Catalog JSON whose keywords profiles draw on (default: bundled data)")
+    generate_parser.add_argument("--dharmas", type=int, default=8, help="Dharma types in a generated catalog")
+    generate_parser.add_argument("--careers", type=int, default=6, help="Careers per dharma type")
+    generate_parser.add_argument("--keywords", type=int, default=9, help="Keywords per dharma type")
+    generate_parser.add_argument("--words", type=int, default=12, help="Words per profile answer")
+    generate_parser.add_argument("--overlap", type=float, default=0.3, help="Share of answer words taken from catalog keywords")
+    generate_parser.add_argument("--duplicate-rate", type=float, default=0.1, help="Share of answers copied from common answers")
+    generate_parser.add_argument("--labeled", action="store_true", help="Give each profile a confirmed calling, for training learned weights")
+    generate_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    
+    daemon_parser = subparsers.add_parser("daemon", help="Keep a warm analyzer and catalog for fast interactive sessions")
+    daemon_parser.add_argument("--socket", default=None, help="Unix socket to listen on (default: CAREER_FINDER_SOCKET or a per-user socket)")
+    daemon_parser.add_argument("--workers", type=int, default=2, help="Worker processes forked from the warm engine")
+    daemon_parser.add_argument("--spacy-model", default=None, help="spaCy pipeline to use, or 'none' for the simple analyzer")
+    daemon_parser.add_argument("--scorer", choices=SCORER_NAMES, default="heuristic", help="Dharma scoring backend")
+    daemon_parser.add_argument("--cache-db", default=None, help="SQLite file caching text analysis, shared by the workers")
+    daemon_parser.add_argument("--top-careers", type=positive_int, default=None, help="Suggest the K most relevant careers across the catalog")
+    daemon_parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible explanations")
+    daemon_parser.add_argument("--watch-catalog", action="store_true", help="Reload the dharma catalog in every worker when its data files change")
+    
+    similar_parser = subparsers.add_parser("similar", help="List the careers most like a given career")
+    similar_parser.add_argument("title", help="Title of a career in the catalog")
+    similar_parser.add_argument("-k", "--count", type=int, default=5, help="Number of similar careers to list")
+    similar_parser.add_argument("--json", action="store_true", help="Print one JSON object per career instead of a table")
+    
+    train_parser = subparsers.add_parser("train", help="Fit learned scoring weights on labeled sessions")
+    train_parser.add_argument("input", help="JSONL file with one profile per line and its confirmed dharma type in \"calling\"")
+    train_parser.add_argument("--output", default=None, help="Weight file to write (default: data/learned_weights.npz)")
+    train_parser.add_argument("--holdout", type=float, default=0.2, help="Share of sessions kept aside to measure accuracy")
+    train_parser.add_argument("--regularization", type=float, default=1.0, help="Inverse regularization strength (C) of the logistic regression")
+    train_parser.add_argument("--seed", type=int, default=0, help="Seed for the holdout split")
+    train_parser.add_argument("--batch-size", type=int, default=64, help="Number of texts analyzed per batch")
+    train_parser.add_argument("--n-process", type=int, default=1, help="Worker processes for text analysis (-1 for all cores)")
+    train_parser.add_argument("--spacy-model", default=None, help="spaCy pipeline to use, or 'none' for the simple analyzer")
+    
+    bench_parser = subparsers.add_parser("bench", help="Benchmark the scoring and analysis hot paths")
+    bench_parser.add_argument("--sizes", nargs="+", choices=("small", "medium", "large"), default=["small", "medium", "large"], help="Input and catalog sizes to run")
+    bench_parser.add_argument("--save", default=None, help="Write the results to this JSON file as a baseline")
+    bench_parser.add_argument("--baseline", default=None, help="Previous results to compare against")
+    bench_parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic inputs")
+    
+    return parser
+
+def run_batch_command(args):
+    """Run the batch subcommand"""
+    from .batch import run_batch, console
+    
+    scored, failed = run_batch(args.input, args.output, seed=args.seed, spacy_model=args.spacy_model,
+                               batch_size=args.batch_size, n_process=args.n_process, scorer=args.scorer,
+                               fuzzy_skills=args.fuzzy_skills, cache_db=args.cache_db, results_db=args.results_db,
+                               top_careers=args.top_careers)
+    console.print(f"[green]Scored {scored} profiles[/green]" + (f", [yellow]{failed} failed[/yellow]" if failed else ""))
+    return 1 if failed and not scored else 0
+
+def run_stream_command(args):
+    """Run the stream subcommand from stdin to stdout"""
+    import os
+    from .batch import stream_profiles, console
+    
+    try:
+        scored, failed = stream_profiles(sys.stdin, sys.stdout, workers=args.workers, window=args.window,
+                                         ordered=args.ordered, chunk_size=max(1, args.chunk_size), seed=args.seed,
+                                         spacy_model=args.spacy_model, scorer=args.scorer, cache_db=args.cache_db,
+                                         top_careers=args.top_careers, fuzzy_skills=args.fuzzy_skills,
+                                         watch_catalog=args.watch_catalog)
+    except BrokenPipeError:
+        # The reader stopped early, as with `| head`; discard what is still buffered
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    console.print(f"[green]Scored {scored} profiles[/green]" + (f", [yellow]{failed} failed[/yellow]" if failed else ""))
+    return 1 if failed and not scored else 0
+
+def run_results_command(args):
+    """Run the results subcommand, printing one JSON record per line"""
+    import json
+    from .data_manager import DataManager
+    
+    with DataManager().open_results_store(args.db) as store:
+        if args.name is not None:
+            records = store.find_by_name(args.name, limit=args.limit)
+        elif args.calling is not None:
+            records = store.find_by_calling(args.calling, limit=args.limit)
+        else:
+            records = store.recent(limit=args.limit)
+    for record in records:
+        print(json.dumps(record))
+    return 0
+
+def run_compare_command(args):
+    """Run the compare subcommand"""
+    from .batch import compare_scorers, print_comparison, console
+    
+    try:
+        report = compare_scorers(args.input, args.scorers, spacy_model=args.spacy_model,
+                                 batch_size=args.batch_size, n_process=args.n_process)
+    except FileNotFoundError as e:
+        # The input, or the weights of a 'learned' reference scorer
+        console.print(f"[bold red]{str(e)}[/bold red]")
+        return 1
+    print_comparison(report)
+    return 0
+
+def run_generate_command(args):
+    """Run the generate subcommand"""
+    import json
+    from .batch import console
+    from .synthetic import SyntheticDataGenerator, write_jsonl
+    
+    generator = SyntheticDataGenerator(seed=args.seed, overlap=args.overlap, duplicate_rate=args.duplicate_rate)
+    if args.kind == "catalog":
+        catalog = generator.catalog(args.dharmas, args.careers, args.keywords)
+        with open(args.output, 'w') as f:
+            json.dump(catalog, f, indent=4)
+        console.print(f"[green]Wrote a catalog of {len(catalog)} dharma types to {args.output}[/green]")
+    else:
+        catalog = None
+        if args.catalog:
+            with open(args.catalog, 'r') as f:
+                catalog = json.load(f)
+        count = write_jsonl(args.output, generator.profiles(args.count, catalog, words_per_answer=args.words,
+                                                                  labeled=args.labeled))
+        console.print(f"[green]Wrote {count} profiles to {args.output}[/green]")
+    return 0
+
+def run_daemon_command(args):
+    """Run the daemon subcommand in the foreground until interrupted"""
+    from .daemon import DaemonError, ScoringDaemon, console
+    
+    try:
+        ScoringDaemon(args.socket, args.workers, scorer=args.scorer, spacy_model=args.spacy_model,
+                      cache_db=args.cache_db, top_careers=args.top_careers, seed=args.seed,
+                      watch_catalog=args.watch_catalog).serve_forever()
+    except DaemonError as e:
+        console.print(f"[bold red]{str(e)}[/bold red]")
+        return 1
+    return 0
+
+def run_similar_command(args):
+    """Run the similar subcommand"""
+    import json
+    import difflib
+    from rich.console import Console
+    from rich.table import Table
+    from .data_manager import DataManager
+    from .scoring_engine import ScoringEngine
+    
+    console = Console()
+    engine = ScoringEngine(catalog=DataManager().load_compiled_catalog())
+    try:
+        similar = engine.similar_careers(args.title, args.count)
+    except KeyError:
+        titles = [career["title"] for data in engine.dharma_paths.values() for career in data["careers"]]
+        suggestions = difflib.get_close_matches(args.title, titles, n=3)
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        console.print(f"[bold red]No career titled '{args.title}' in the catalog.{hint}[/bold red]")
+        return 1
+    
+    if args.json:
+        for career in similar:
+            print(json.dumps(career))
+        return 0
+    
+    table = Table(title=f"Careers Like {args.title}")
+    table.add_column("Career")
+    table.add_column("Calling")
+    table.add_column("Similarity", justify="right")
+    for career in similar:
+        table.add_row(career["title"], career["dharma_type"].replace("_", " "), f"{career['similarity']:.2f}")
+    console.print(table)
+    return 0
+
+def run_train_command(args):
+    """Run the train subcommand"""
+    from .training import train_from_file, print_training_report
+    
+    report = train_from_file(args.input, output_path=args.output, holdout=args.holdout,
+                             regularization=args.regularization, seed=args.seed, spacy_model=args.spacy_model,
+                             batch_size=args.batch_size, n_process=args.n_process)
+    print_training_report(report)
+    return 0 if report["trained"] else 1
+
+def run_bench_command(args):
+    """Run the bench subcommand; fails when a regression is found"""
+    from .benchmark import run_benchmarks
+    
+    regressions = run_benchmarks(args.sizes, save_path=args.save, baseline_path=args.baseline,
+                                 threshold=args.threshold, seed=args.seed)
+    return 1 if regressions else 0
+
+def main(argv=None):
     """Main entry point for the application"""
-    app = CareerFinder()
+    args = build_parser().parse_args(argv)
+    
+    if args.trace_json or args.metrics_file:
+        from . import metrics
+        metrics.enable(trace=bool(args.trace_json))
+        try:
+            run_command(args)
+        finally:
+            metrics.export(args.trace_json, args.metrics_file)
+    else:
+        run_command(args)
+
+def run_command(args):
+    """Run the selected subcommand, or the interactive finder"""
+    if args.command == "batch":
+        sys.exit(run_batch_command(args))
+    if args.command == "stream":
+        sys.exit(run_stream_command(args))
+    if args.command == "results":
+        sys.exit(run_results_command(args))
+    if args.command == "compare":
+        sys.exit(run_compare_command(args))
+    if args.command == "generate":
+        sys.exit(run_generate_command(args))
+    if args.command == "daemon":
+        sys.exit(run_daemon_command(args))
+    if args.command == "similar":
+        sys.exit(run_similar_command(args))
+    if args.command == "train":
+        sys.exit(run_train_command(args))
+    if args.command == "bench":
+        sys.exit(run_bench_command(args))
+    
+    from .career_finder import CareerFinder
+    app = CareerFinder(pacing=args.pacing, use_daemon=args.use_daemon)
     app.run()
 
 if __name__ == "__main__":
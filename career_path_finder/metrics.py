@@ -0,0 +1,218 @@
+"""
+Low-overhead timing instrumentation for Career Path Finder
+
+Instrumentation is off by default: span() then returns a shared no-op
+context manager and increment() returns immediately. Enable it with
+enable() or by setting CAREER_FINDER_METRICS=1.
+"""
+
+import os
+import json
+import time
+import functools
+import threading
+
+# Longest trace kept in memory; older events are dropped first
+MAX_TRACE_EVENTS = 100000
+
+class _NullSpan:
+    """Context manager that does nothing, used while instrumentation is disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    """Times a block and records it in the registry"""
+    
+    __slots__ = ("registry", "name", "start")
+    
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.registry.record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+class MetricsRegistry:
+    """Span timings, counters and an optional trace for one process"""
+    
+    def __init__(self):
+        """Initialize an empty, disabled registry"""
+        self.enabled = False
+        self.trace_enabled = False
+        self.origin = time.perf_counter()
+        self.wall_origin = time.time()
+        self.timings = {}  # name -> [count, total seconds, max seconds]
+        self.counters = {}
+        self.events = []
+        self._lock = threading.Lock()
+    
+    def enable(self, trace=True):
+        """Start recording spans and counters, and trace events if trace is set"""
+        self.enabled = True
+        self.trace_enabled = trace
+    
+    def disable(self):
+        """Stop recording"""
+        self.enabled = False
+    
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.timings = {}
+            self.counters = {}
+            self.events = []
+    
+    def record(self, name, start, duration):
+        """Record one completed span"""
+        with self._lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                self.timings[name] = [1, duration, duration]
+            else:
+                timing[0] += 1
+                timing[1] += duration
+                if duration > timing[2]:
+                    timing[2] = duration
+            if self.trace_enabled:
+                if len(self.events) >= MAX_TRACE_EVENTS:
+                    del self.events[:MAX_TRACE_EVENTS // 10]
+                self.events.append((name, self.wall_origin + (start - self.origin), duration,
+                                    os.getpid(), threading.get_ident()))
+    
+    def increment(self, name, value=1):
+        """Add to a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def drain(self):
+        """Return everything recorded since the last drain and reset, for shipping to a parent process"""
+        with self._lock:
+            snapshot = {"timings": self.timings, "counters": self.counters, "events": self.events}
+            self.timings = {}
+            self.counters = {}
+            self.events = []
+        return snapshot
+    
+    def merge(self, snapshot):
+        """Fold a drained snapshot from another process into this registry"""
+        with self._lock:
+            for name, (count, total, longest) in snapshot["timings"].items():
+                timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+                timing[0] += count
+                timing[1] += total
+                timing[2] = max(timing[2], longest)
+            for name, value in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            if self.trace_enabled:
+                self.events.extend(snapshot["events"])
+                if len(self.events) > MAX_TRACE_EVENTS:
+                    del self.events[:len(self.events) - MAX_TRACE_EVENTS]
+    
+    def summary(self):
+        """Per-span count, total, mean and max in seconds, plus counters"""
+        with self._lock:
+            return {
+                "spans": {
+                    name: {"count": count, "total_seconds": total, "mean_seconds": total / count, "max_seconds": longest}
+                    for name, (count, total, longest) in sorted(self.timings.items())
+                },
+                "counters": dict(sorted(self.counters.items()))
+            }
+    
+    def trace(self):
+        """The run as Chrome trace events, viewable in chrome://tracing or Perfetto"""
+        with self._lock:
+            events = list(self.events)
+        return {
+            "traceEvents": [
+                {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": tid}
+                for name, start, duration, pid, tid in events
+            ],
+            "summary": self.summary()
+        }
+    
+    def prometheus(self, prefix="career_path_finder"):
+        """Render timings and counters in the Prometheus text exposition format"""
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_span_seconds Time spent in instrumented stages.",
+            f"# TYPE {prefix}_span_seconds summary"
+        ]
+        for name, span in summary["spans"].items():
+            lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {span["count"]}')
+            lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {span["total_seconds"]:.9f}')
+        lines.append(f"# HELP {prefix}_span_max_seconds Longest single run of each stage.")
+        lines.append(f"# TYPE {prefix}_span_max_seconds gauge")
+        for name, span in summary["spans"].items():
+            lines.append(f'{prefix}_span_max_seconds{{span="{name}"}} {span["max_seconds"]:.9f}')
+        lines.append(f"# HELP {prefix}_events_total Counted events.")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in summary["counters"].items():
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+    
+    def write_trace(self, path):
+        """Write the JSON trace to a file"""
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
+    
+    def write_prometheus(self, path):
+        """Write the Prometheus text file atomically, so a scraper never sees a partial file"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.prometheus())
+        os.replace(temp_path, path)
+
+# Registry for the current process
+registry = MetricsRegistry()
+if os.environ.get("CAREER_FINDER_METRICS", "").lower() in ("1", "true", "yes"):
+    registry.enable()
+
+def span(name):
+    """Time a block: `with span("stage"): ...`; free when instrumentation is disabled"""
+    if not registry.enabled:
+        return NULL_SPAN
+    return _Span(registry, name)
+
+def timed(name):
+    """Decorator that times every call of a function as a span"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            with _Span(registry, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def increment(name, value=1):
+    """Add to a counter when instrumentation is enabled"""
+    if registry.enabled:
+        registry.increment(name, value)
+
+def enable(trace=True):
+    """Enable instrumentation in this process"""
+    registry.enable(trace)
+
+def is_enabled():
+    """Whether instrumentation is enabled in this process"""
+    return registry.enabled
+
+def export(trace_path=None, prometheus_path=None):
+    """Write whichever outputs were requested"""
+    if trace_path:
+        registry.write_trace(trace_path)
+    if prometheus_path:
+        registry.write_prometheus(prometheus_path)
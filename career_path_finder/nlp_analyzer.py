@@ -2,97 +2,327 @@
 NLP analysis functionality for Career Path Finder
 """
 
-from collections import Counter
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+import os
+import itertools
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from rich.console import Console
 
-# Initialize Rich console
-console = Console()
+from .analysis_cache import AnalysisCache, cache_key
+from .metrics import increment, span, timed
+from .nltk_resources import resources
+
+# Initialize Rich console on stderr so warnings do not mix with piped results
+console = Console(stderr=True)
+
+# spaCy pipeline to load, overridable with CAREER_FINDER_SPACY_MODEL ("none" disables spaCy)
+DEFAULT_SPACY_MODEL = os.environ.get("CAREER_FINDER_SPACY_MODEL", "en_core_web_sm")
+
+# Bump when the analysis logic changes so cached results are not reused
+ANALYZER_VERSION = 1
+
+# Longest wait for a background NLTK download before analyzing with what is installed
+NLTK_READY_TIMEOUT = 10
+
+# Components the analysis never reads; only POS tags, lemmas, stop flags and noun chunks are used
+DEFAULT_SPACY_EXCLUDE = ("ner", "senter")
+
+# Number of key words, and of key phrases from the simple analysis, kept in a result
+KEY_WORD_LIMIT = 10
+SIMPLE_PHRASE_LIMIT = 5
 
 class NLPAnalyzer:
     """Class for analyzing text using NLP techniques"""
     
-    def __init__(self, spacy_nlp=None):
-        """Initialize the analyzer with optional spaCy model"""
-        self.nlp = spacy_nlp
-        self.spacy_available = spacy_nlp is not None
+    def __init__(self, spacy_nlp=None, model_name=None, exclude=DEFAULT_SPACY_EXCLUDE, cache=None):
+        """Initialize the analyzer with an optional spaCy model or the name of one to load lazily
+        
+        cache is an AnalysisCache; pass False to disable caching. By default
+        results are cached in memory, and also in the SQLite file named by
+        CAREER_FINDER_ANALYSIS_CACHE if it is set.
+        """
+        self._nlp = spacy_nlp
+        self.model_name = model_name or DEFAULT_SPACY_MODEL
+        self.exclude = list(exclude)
+        self._load_attempted = spacy_nlp is not None or self.model_name.lower() == "none"
+        if cache is None:
+            cache = AnalysisCache(db_path=os.environ.get("CAREER_FINDER_ANALYSIS_CACHE"))
+        self.cache = cache or None
+    
+    @property
+    def nlp(self):
+        """The spaCy pipeline, loaded on first use"""
+        if not self._load_attempted:
+            self._load_attempted = True
+            self._nlp = self._load_spacy_model()
+        return self._nlp
+    
+    @property
+    def spacy_available(self):
+        """Whether a spaCy pipeline could be loaded"""
+        return self.nlp is not None
+    
+    def _load_spacy_model(self):
+        """Load the configured spaCy pipeline without unused components, or None if unavailable"""
+        try:
+            import spacy
+            return spacy.load(self.model_name, exclude=self.exclude)
+        except:
+            return None
+    
+    @property
+    def backend_id(self):
+        """Identifies the analysis backend and version, so cached results are never mixed"""
+        if self.spacy_available:
+            import spacy
+            return f"spacy:{ANALYZER_VERSION}:{self.model_name}:{self.nlp.meta.get('version')}:{spacy.__version__}"
+        resources.wait_ready(NLTK_READY_TIMEOUT)
+        return f"simple:{ANALYZER_VERSION}:punkt={resources.tokenizer_available}:stopwords={resources.stop_words() is not None}"
     
+    @timed("nlp.analyze_text")
     def analyze_text(self, text):
         """Analyze text using NLP techniques"""
+        if self.cache is None:
+            return self._analyze_uncached(text)
+        
+        key = cache_key(self.backend_id, text)
+        result = self.cache.get(key)
+        if result is None:
+            increment("nlp.cache_misses")
+            result = self._analyze_uncached(text)
+            self.cache.put(key, result)
+        else:
+            increment("nlp.cache_hits")
+        return _copy_result(result)
+    
+    def _analyze_uncached(self, text):
+        """Analyze text with the available backend"""
         if self.spacy_available:
             return self._analyze_with_spacy(text)
         else:
             return self._analyze_simple(text)
     
+    def analyze_many(self, texts, batch_size=64, n_process=1):
+        """Analyze many texts in batches, yielding one result per text in input order
+        
+        spaCy documents are streamed through nlp.pipe; without spaCy the simple
+        analysis is spread over a process pool. n_process=-1 uses every core.
+        Cached texts, and repeats within a batch, are only analyzed once.
+        """
+        if self.cache is None:
+            return self._analyze_many_uncached(texts, batch_size, n_process)
+        return self._analyze_many_cached(texts, batch_size, n_process)
+    
+    def _analyze_many_cached(self, texts, batch_size, n_process):
+        """Look texts up in the cache as they stream past and send only the misses through one pipeline
+        
+        The whole input shares one nlp.pipe or process pool. Each text holds
+        a place in an output queue; hits fill theirs at once, misses when
+        the pipeline returns them, and repeats of a text still in the
+        pipeline wait for its result. Results leave the queue in input order.
+        """
+        backend_id = self.backend_id
+        # One [result] cell per text read but not yet yielded, in input order
+        queued = deque()
+        # Keys of texts in the pipeline, in the order sent, and the cells waiting on each
+        sent = deque()
+        waiting = {}
+        
+        def misses():
+            for text in texts:
+                key = cache_key(backend_id, text)
+                cell = [None]
+                queued.append(cell)
+                if key in waiting:
+                    waiting[key].append(cell)
+                    continue
+                cell[0] = self.cache.get(key)
+                if cell[0] is None:
+                    waiting[key] = [cell]
+                    sent.append(key)
+                    yield text
+        
+        count = analyzed = 0
+        try:
+            for result in self._analyze_many_uncached(misses(), batch_size, n_process):
+                key = sent.popleft()
+                self.cache.put(key, result)
+                for cell in waiting.pop(key):
+                    cell[0] = result
+                analyzed += 1
+                while queued and queued[0][0] is not None:
+                    count += 1
+                    yield _copy_result(queued.popleft()[0])
+            # Hits after the last miss
+            while queued:
+                count += 1
+                yield _copy_result(queued.popleft()[0])
+        finally:
+            increment("nlp.cache_hits", count - analyzed)
+            increment("nlp.cache_misses", analyzed)
+            self.cache.flush()
+    
+    def extract_terms(self, text):
+        """Count the words and collect the phrases of a text without summarizing them
+        
+        Terms of several texts can be combined with merge_terms and turned into
+        a result with summarize_terms, which is how answers are analyzed one at
+        a time as they are entered.
+        """
+        if self.spacy_available:
+            try:
+                with span("nlp.spacy_pipeline"):
+                    doc = self.nlp(text.lower())
+                return self._terms_from_doc(doc)
+            except Exception as e:
+                console.print(f"[yellow]spaCy analysis encountered an issue: {str(e)}. Using simpler analysis.[/yellow]")
+        return simple_text_terms(text)
+    
+    def _analyze_many_uncached(self, texts, batch_size, n_process):
+        """Analyze many texts with the available backend"""
+        if self.spacy_available:
+            return self._analyze_many_with_spacy(texts, batch_size, n_process)
+        else:
+            return self._analyze_many_simple(texts, batch_size, n_process)
+    
     def _analyze_with_spacy(self, text):
         """Use spaCy for more sophisticated analysis"""
         try:
             # Process text with spaCy
-            doc = self.nlp(text.lower())
-            
-            # Extract key nouns and verbs that might indicate interests
-            key_words = []
-            for token in doc:
-                # Get verbs and nouns that aren't stopwords
-                if (token.pos_ in ["VERB", "NOUN"]) and not token.is_stop:
-                    key_words.append(token.lemma_)
-            
-            # Count frequencies
-            word_freq = Counter(key_words)
-            most_common = word_freq.most_common(10)
-            
-            # Extract key phrases using noun chunks
-            key_phrases = [chunk.text.lower() for chunk in doc.noun_chunks if len(chunk.text) > 3]
-            
-            return {
-                "key_words": [word for word, _ in most_common],
-                "key_phrases": key_phrases
-            }
+            with span("nlp.spacy_pipeline"):
+                doc = self.nlp(text.lower())
+            return self._summarize_doc(doc)
         except Exception as e:
             console.print(f"[yellow]spaCy analysis encountered an issue: {str(e)}. Using simpler analysis.[/yellow]")
             return self._analyze_simple(text)
     
+    def _analyze_many_with_spacy(self, texts, batch_size, n_process):
+        """Stream texts through nlp.pipe, falling back to simpler analysis on failure"""
+        texts, pending = itertools.tee(texts)
+        try:
+            docs = self.nlp.pipe((text.lower() for text in texts), batch_size=batch_size, n_process=n_process)
+            for doc in docs:
+                next(pending)
+                yield self._summarize_doc(doc)
+        except Exception as e:
+            console.print(f"[yellow]spaCy analysis encountered an issue: {str(e)}. Using simpler analysis.[/yellow]")
+            yield from self._analyze_many_simple(pending, batch_size, n_process)
+    
+    @timed("nlp.spacy_summarize")
+    def _summarize_doc(self, doc):
+        """Extract key words and phrases from a processed spaCy document"""
+        return summarize_terms(self._terms_from_doc(doc))
+    
+    def _terms_from_doc(self, doc):
+        """Count key word lemmas and collect noun chunks of a processed spaCy document"""
+        # Extract key nouns and verbs that might indicate interests
+        key_words = []
+        for token in doc:
+            # Get verbs and nouns that aren't stopwords
+            if (token.pos_ in ["VERB", "NOUN"]) and not token.is_stop:
+                key_words.append(token.lemma_)
+        
+        # Extract key phrases using noun chunks; every chunk is kept
+        key_phrases = [chunk.text.lower() for chunk in doc.noun_chunks if len(chunk.text) > 3]
+        
+        return {"word_counts": Counter(key_words), "phrases": key_phrases, "phrase_limit": None, "edges": None}
+    
     def _analyze_simple(self, text):
         """Simpler text analysis as fallback"""
-        try:
-            # Try to tokenize with NLTK
+        return analyze_simple_text(text)
+    
+    def _analyze_many_simple(self, texts, batch_size, n_process):
+        """Run the simple analysis over many texts, on a process pool when n_process allows"""
+        if n_process == -1:
+            n_process = os.cpu_count() or 1
+        if n_process <= 1:
+            for text in texts:
+                yield analyze_simple_text(text)
+            return
+        
+        with ProcessPoolExecutor(max_workers=n_process) as executor:
+            yield from executor.map(analyze_simple_text, texts, chunksize=batch_size)
+
+
+def _copy_result(result):
+    """Copy a result so callers cannot modify a cached entry"""
+    return {"key_words": list(result["key_words"]), "key_phrases": list(result["key_phrases"])}
+
+def summarize_terms(terms):
+    """Turn counted terms into a result with the most common key words and phrases"""
+    most_common = terms["word_counts"].most_common(KEY_WORD_LIMIT)
+    phrases = terms["phrases"]
+    if terms["phrase_limit"] is not None:
+        phrases = [phrase for phrase, _ in Counter(phrases).most_common(terms["phrase_limit"])]
+    return {
+        "key_words": [word for word, _ in most_common],
+        "key_phrases": list(phrases)
+    }
+
+def merge_terms(all_terms):
+    """Combine the terms of several texts, in order, as if they were joined with spaces"""
+    word_counts = Counter()
+    phrases = []
+    phrase_limit = None
+    first_word = last_word = None
+    for terms in all_terms:
+        word_counts.update(terms["word_counts"])
+        edges = terms["edges"]
+        if edges is not None:
+            # Two-word phrases spanning the join, as the simple analysis would find in the joined text
+            if last_word is not None and len(last_word) > 3 and len(edges[0]) > 3:
+                phrases.append(last_word + " " + edges[0])
+            if first_word is None:
+                first_word = edges[0]
+            last_word = edges[1]
+        phrases.extend(terms["phrases"])
+        phrase_limit = terms["phrase_limit"]
+    edges = (first_word, last_word) if first_word is not None else None
+    return {"word_counts": word_counts, "phrases": phrases, "phrase_limit": phrase_limit, "edges": edges}
+
+@timed("nlp.simple")
+def analyze_simple_text(text):
+    """Simpler text analysis as fallback, usable from worker processes"""
+    return summarize_terms(simple_text_terms(text))
+
+def simple_text_terms(text):
+    """Count the words and collect the two-word phrases of a text for the simple analysis"""
+    try:
+        # Wait for the resource check instead of racing a download
+        resources.wait_ready(NLTK_READY_TIMEOUT)
+        
+        # Try to tokenize with NLTK
+        tokens = None
+        if resources.tokenizer_available:
             try:
-                # Tokenize and remove stopwords
-                tokens = word_tokenize(text.lower())
-                try:
-                    stop_words = set(stopwords.words('english'))
-                    filtered_tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
-                except:
-                    # If stopwords fail, just filter out non-alphanumeric
-                    filtered_tokens = [word for word in tokens if word.isalnum()]
-            except:
-                # If NLTK tokenization fails, use simple split
-                console.print("[yellow]NLTK tokenization failed. Using simple word splitting.[/yellow]")
-                tokens = text.lower().split()
-                filtered_tokens = [word for word in tokens if len(word) > 2]
-            
-            # Count word frequencies
-            word_freq = Counter(filtered_tokens)
-            most_common = word_freq.most_common(10)
-            
-            # Extract simple phrases (consecutive words)
-            words = text.lower().split()
-            phrases = []
-            for i in range(len(words)-1):
-                if len(words[i]) > 3 and len(words[i+1]) > 3:
-                    phrases.append(words[i] + " " + words[i+1])
-            
-            phrase_freq = Counter(phrases)
-            common_phrases = phrase_freq.most_common(5) if phrases else []
-            
-            return {
-                "key_words": [word for word, _ in most_common] if most_common else [],
-                "key_phrases": [phrase for phrase, _ in common_phrases] if common_phrases else []
-            }
-        except Exception as e:
-            console.print(f"[yellow]Simple text analysis failed: {str(e)}. Using keyword matching only.[/yellow]")
-            return {
-                "key_words": [],
-                "key_phrases": []
-            }
+                # Imported here so starting the CLI does not pay for loading NLTK
+                from nltk.tokenize import word_tokenize
+                with span("nlp.tokenize"):
+                    tokens = word_tokenize(text.lower())
+            except Exception:
+                tokens = None
+        
+        if tokens is not None:
+            # Remove stopwords if the list is installed, and non-alphanumeric tokens
+            stop_words = resources.stop_words()
+            if stop_words is not None:
+                filtered_tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
+            else:
+                filtered_tokens = [word for word in tokens if word.isalnum()]
+        else:
+            # Without NLTK tokenizer data, use simple split
+            tokens = text.lower().split()
+            filtered_tokens = [word for word in tokens if len(word) > 2]
+        
+        # Extract simple phrases (consecutive words)
+        words = text.lower().split()
+        phrases = []
+        for i in range(len(words)-1):
+            if len(words[i]) > 3 and len(words[i+1]) > 3:
+                phrases.append(words[i] + " " + words[i+1])
+        
+        edges = (words[0], words[-1]) if words else None
+        return {"word_counts": Counter(filtered_tokens), "phrases": phrases, "phrase_limit": SIMPLE_PHRASE_LIMIT, "edges": edges}
+    except Exception as e:
+        console.print(f"[yellow]Simple text analysis failed: {str(e)}. Using keyword matching only.[/yellow]")
+        return {"word_counts": Counter(), "phrases": [], "phrase_limit": SIMPLE_PHRASE_LIMIT, "edges": None}
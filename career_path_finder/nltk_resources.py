@@ -0,0 +1,152 @@
+"""
+Offline-first NLTK resource management for Career Path Finder
+"""
+
+import os
+import threading
+from pathlib import Path
+from rich.console import Console
+
+# Initialize Rich console on stderr so warnings do not mix with piped results
+console = Console(stderr=True)
+
+# Resources the application uses, mapped to their path inside an NLTK data directory
+NLTK_RESOURCES = {
+    "punkt_tab": "tokenizers/punkt_tab",
+    "punkt": "tokenizers/punkt",
+    "stopwords": "corpora/stopwords",
+}
+
+# What the application needs, each met by any one of its resources, tried in this order;
+# word_tokenize reads punkt_tab in current NLTK releases and punkt in older ones
+NLTK_REQUIREMENTS = {
+    "tokenizer": ("punkt_tab", "punkt"),
+    "stopwords": ("stopwords",),
+}
+
+# Pre-staged corpora shipped next to the dharma data, if present
+VENDORED_NLTK_DATA = Path(os.path.dirname(os.path.abspath(__file__))).parent / "data" / "nltk_data"
+
+def offline_mode():
+    """Whether downloads are disabled via CAREER_FINDER_NLTK_OFFLINE"""
+    return os.environ.get("CAREER_FINDER_NLTK_OFFLINE", "").lower() in ("1", "true", "yes")
+
+class NLTKResourceManager:
+    """Checks, stages and loads NLTK resources with an explicit readiness state
+    
+    Availability is checked on the local filesystem only. Downloads happen
+    only when asked for and not in offline mode. Analysis waits on
+    wait_ready() instead of racing a download thread.
+    """
+    
+    def __init__(self, data_dirs=None, offline=None):
+        """Initialize the manager with extra data directories to search first"""
+        if data_dirs is None:
+            data_dirs = [os.environ.get("CAREER_FINDER_NLTK_DATA"), str(VENDORED_NLTK_DATA)]
+        self.data_dirs = [str(path) for path in data_dirs if path and os.path.isdir(str(path))]
+        self.offline = offline_mode() if offline is None else offline
+        self.available = {}
+        self._stop_words = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def check(self):
+        """Check which resources are installed, without any network access"""
+        import nltk
+        for path in reversed(self.data_dirs):
+            if path not in nltk.data.path:
+                nltk.data.path.insert(0, path)
+        
+        available = {}
+        for name, resource_path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(resource_path)
+                available[name] = True
+            except LookupError:
+                available[name] = False
+        self.available = available
+        return available
+    
+    def missing(self):
+        """Names of requirements from NLTK_REQUIREMENTS that none of the installed resources meet"""
+        return [requirement for requirement, names in NLTK_REQUIREMENTS.items()
+                if not any(self.available.get(name) for name in names)]
+    
+    def download(self, names=None, download_dir=None, quiet=True):
+        """Download resources, e.g. to pre-stage a directory for air-gapped hosts; returns the ones that failed"""
+        import nltk
+        failed = []
+        for name in names or list(NLTK_RESOURCES):
+            if not nltk.download(name, download_dir=download_dir, quiet=quiet):
+                failed.append(name)
+        return failed
+    
+    def download_missing(self, requirements=None, download_dir=None, quiet=True):
+        """Download one resource for each unmet requirement, trying alternatives in order; returns the requirements still unmet"""
+        failed = []
+        for requirement in self.missing() if requirements is None else requirements:
+            for name in NLTK_REQUIREMENTS[requirement]:
+                if not self.download([name], download_dir, quiet):
+                    break
+            else:
+                failed.append(requirement)
+        return failed
+    
+    def prepare(self, download=False):
+        """Check resources, optionally download missing ones, and mark the manager ready"""
+        with self._lock:
+            if self._ready.is_set():
+                return self.available
+            try:
+                self.check()
+                if download and not self.offline and self.missing():
+                    self.download_missing()
+                    self.check()
+                self._load_stop_words()
+            except Exception as e:
+                console.print(f"[yellow]Warning: Could not prepare NLTK resources: {str(e)}[/yellow]")
+            if not self.tokenizer_available:
+                console.print("[yellow]NLTK tokenizer data is not installed. Using simple word splitting.[/yellow]")
+            self._ready.set()
+            return self.available
+    
+    def start_background(self, download=True):
+        """Prepare resources on a background thread"""
+        if self._thread is None and not self._ready.is_set():
+            self._thread = threading.Thread(target=self.prepare, kwargs={"download": download})
+            self._thread.daemon = True
+            self._thread.start()
+        return self._thread
+    
+    def wait_ready(self, timeout=None):
+        """Block until resources are prepared; prepares synchronously (offline) if nothing started
+        
+        Returns False if a background preparation is still running after timeout.
+        """
+        if self._thread is None:
+            self.prepare(download=False)
+        return self._ready.wait(timeout)
+    
+    @property
+    def ready(self):
+        """Whether resources have been prepared"""
+        return self._ready.is_set()
+    
+    @property
+    def tokenizer_available(self):
+        """Whether word_tokenize has its punkt data"""
+        return "tokenizer" not in self.missing()
+    
+    def _load_stop_words(self):
+        """Load the English stopword list once"""
+        if self.available.get("stopwords"):
+            from nltk.corpus import stopwords
+            self._stop_words = frozenset(stopwords.words('english'))
+    
+    def stop_words(self):
+        """The English stopword set, or None if it is not installed"""
+        return self._stop_words
+
+# Shared manager for the current process
+resources = NLTKResourceManager()
@@ -0,0 +1,47 @@
+"""
+Pacing of the interactive session for Career Path Finder
+"""
+
+import os
+import sys
+import time
+
+# Pauses, in seconds, after each kind of screen; analysis itself is never padded
+PACING_PROFILES = {
+    "interactive": {
+        "intro": 1.0,
+        "greeting": 1.0,
+    },
+    "none": {
+        "intro": 0.0,
+        "greeting": 0.0,
+    },
+}
+
+class Pacing:
+    """Class for the pauses between screens of the interactive session"""
+    
+    def __init__(self, name="interactive"):
+        """Initialize the pacing from a named profile"""
+        if name not in PACING_PROFILES:
+            raise ValueError(f"Unknown pacing profile '{name}'. Choose from: {', '.join(sorted(PACING_PROFILES))}")
+        self.name = name
+        self.delays = PACING_PROFILES[name]
+    
+    def pause(self, kind):
+        """Pause after a screen of the given kind, if the profile asks for it"""
+        delay = self.delays.get(kind, 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+def default_pacing_name():
+    """Pick the pacing profile from CAREER_FINDER_PACING, or by whether a person is at the terminal"""
+    name = os.environ.get("CAREER_FINDER_PACING")
+    if name:
+        return name
+    # Piped or scripted input gets no pauses
+    return "interactive" if sys.stdin.isatty() else "none"
+
+def get_pacing(name=None):
+    """Return a Pacing for the named profile, or the default one"""
+    return Pacing(name or default_pacing_name())
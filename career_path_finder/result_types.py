@@ -0,0 +1,132 @@
+"""
+Compact result types for Career Path Finder
+"""
+
+from collections.abc import Mapping
+
+class CareerSuggestion(Mapping):
+    """One career suggestion that refers to catalog entries instead of copying them
+    
+    The title, descriptions and suggested skills are shared with the catalog
+    and every other suggestion of the same career; only the user's relevant
+    skills are stored per suggestion. Reads like the dict it replaces, and
+    to_dict() builds that dict for serialization. Ranked suggestions also
+    carry their relevance.
+    """
+    
+    __slots__ = ("career", "true_calling", "calling_description", "relevant_skills", "suggested_skills",
+                 "alignment_explanation", "relevance")
+    
+    # Keys of the dict form, in output order; "relevance" follows for ranked suggestions
+    FIELDS = ("title", "description", "true_calling", "calling_description", "has_relevant_skills",
+              "relevant_skills", "suggested_skills", "alignment_explanation")
+    
+    def __init__(self, career, true_calling, calling_description, relevant_skills, suggested_skills,
+                 alignment_explanation, relevance=None):
+        """Initialize the suggestion from a catalog career entry and shared strings"""
+        self.career = career
+        self.true_calling = true_calling
+        self.calling_description = calling_description
+        self.relevant_skills = relevant_skills
+        self.suggested_skills = suggested_skills
+        self.alignment_explanation = alignment_explanation
+        self.relevance = relevance
+    
+    @property
+    def title(self):
+        """The career's title"""
+        return self.career["title"]
+    
+    @property
+    def description(self):
+        """The career's description"""
+        return self.career["description"]
+    
+    @property
+    def has_relevant_skills(self):
+        """Whether any of the user's skills are relevant to this career"""
+        return bool(self.relevant_skills)
+    
+    def _fields(self):
+        """The dict keys of this suggestion"""
+        return self.FIELDS if self.relevance is None else self.FIELDS + ("relevance",)
+    
+    def __getitem__(self, key):
+        """Read a field by its dict key"""
+        if key not in self._fields():
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        """Iterate over the dict keys"""
+        return iter(self._fields())
+    
+    def __len__(self):
+        """Number of dict keys"""
+        return len(self._fields())
+    
+    def to_dict(self):
+        """Return the suggestion as a plain JSON-serializable dict"""
+        result = {
+            "title": self.title,
+            "description": self.description,
+            "true_calling": self.true_calling,
+            "calling_description": self.calling_description,
+            "has_relevant_skills": self.has_relevant_skills,
+            "relevant_skills": list(self.relevant_skills),
+            "suggested_skills": list(self.suggested_skills),
+            "alignment_explanation": self.alignment_explanation
+        }
+        if self.relevance is not None:
+            result["relevance"] = self.relevance
+        return result
+    
+    def __repr__(self):
+        """Short form for debugging"""
+        return f"CareerSuggestion({self.title!r}, true_calling={self.true_calling!r})"
+
+
+class ScoringResult(Mapping):
+    """The results of scoring one profile, readable like the dict it replaces"""
+    
+    __slots__ = ("true_callings", "top_dharmas", "dharma_scores", "career_suggestions", "personalized_insights",
+                 "nlp_keywords")
+    
+    def __init__(self, true_callings, top_dharmas, dharma_scores, career_suggestions, personalized_insights,
+                 nlp_keywords):
+        """Initialize the result from its parts"""
+        self.true_callings = true_callings
+        self.top_dharmas = top_dharmas
+        self.dharma_scores = dharma_scores
+        self.career_suggestions = career_suggestions
+        self.personalized_insights = personalized_insights
+        self.nlp_keywords = nlp_keywords
+    
+    def __getitem__(self, key):
+        """Read a field by its dict key"""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        """Iterate over the dict keys"""
+        return iter(self.__slots__)
+    
+    def __len__(self):
+        """Number of dict keys"""
+        return len(self.__slots__)
+    
+    def to_dict(self):
+        """Return the result as a plain JSON-serializable dict"""
+        return {
+            "true_callings": list(self.true_callings),
+            "top_dharmas": list(self.top_dharmas),
+            "dharma_scores": dict(self.dharma_scores),
+            "career_suggestions": [suggestion.to_dict() for suggestion in self.career_suggestions],
+            "personalized_insights": list(self.personalized_insights),
+            "nlp_keywords": list(self.nlp_keywords)
+        }
+    
+    def __repr__(self):
+        """Short form for debugging"""
+        return f"ScoringResult(top_dharmas={self.top_dharmas!r})"
@@ -0,0 +1,155 @@
+"""
+Results store for Career Path Finder
+"""
+
+import json
+import time
+import queue
+import sqlite3
+import threading
+from rich.console import Console
+
+from .metrics import increment, span
+
+# Initialize Rich console
+console = Console()
+
+class ResultsStore:
+    """Append-only SQLite store of scored results, indexed by name, time and top calling
+    
+    Results are written by a background thread. Whatever has been queued
+    when it wakes up is committed as one transaction, so a save is either
+    stored completely or not at all, and bulk runs pay for one commit per
+    batch instead of one per result.
+    """
+    
+    def __init__(self, db_path, batch_size=500, max_pending=5000):
+        """Open the store, creating its tables if needed, and start the writer"""
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "id INTEGER PRIMARY KEY, name TEXT NOT NULL, name_key TEXT NOT NULL, created_at REAL NOT NULL, "
+            "top_dharma TEXT, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_name ON results (name_key, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_top_dharma ON results (top_dharma, created_at)")
+        self._db.commit()
+        self._writer = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._writer.start()
+    
+    def _connect(self):
+        """Open a connection to the store"""
+        db = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+    
+    def add(self, name, results, created_at=None):
+        """Queue a result for writing; blocks only when the writer is far behind
+        
+        results is stored as JSON; top_dharmas, if present, supplies the
+        calling the record is indexed by.
+        """
+        top_dharmas = results.get("top_dharmas") or []
+        row = (
+            name or "",
+            (name or "").strip().lower(),
+            time.time() if created_at is None else created_at,
+            top_dharmas[0] if top_dharmas else None,
+            json.dumps(results),
+        )
+        self._queue.put(row)
+    
+    def _run(self):
+        """Commit queued results in batches until close() is called"""
+        db = self._connect()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # Take whatever else is already waiting, without delaying the first row
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = None in batch
+            rows = [row for row in batch if row is not None]
+            try:
+                if rows:
+                    with span("results.commit"), db:
+                        db.executemany(
+                            "INSERT INTO results (name, name_key, created_at, top_dharma, payload) VALUES (?, ?, ?, ?, ?)",
+                            rows
+                        )
+                    self.written += len(rows)
+                    increment("results.written", len(rows))
+            except sqlite3.Error as e:
+                self.failed += len(rows)
+                increment("results.failed", len(rows))
+                console.print(f"[bold red]Error saving results: {str(e)}[/bold red]")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        db.close()
+    
+    def flush(self):
+        """Wait until every queued result has been committed"""
+        self._queue.join()
+    
+    def _query(self, where, params, limit):
+        """Return stored results matching a WHERE clause, newest first"""
+        sql = f"SELECT id, name, created_at, top_dharma, payload FROM results {where} ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + (limit,)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {"id": row_id, "name": name, "created_at": created_at, "top_dharma": top_dharma, "results": json.loads(payload)}
+            for row_id, name, created_at, top_dharma, payload in rows
+        ]
+    
+    def find_by_name(self, name, limit=None):
+        """Return every result saved under a name (case-insensitive), newest first"""
+        return self._query("WHERE name_key = ?", ((name or "").strip().lower(),), limit)
+    
+    def find_by_calling(self, dharma_type, limit=None):
+        """Return results whose top calling is the given dharma type, newest first"""
+        return self._query("WHERE top_dharma = ?", (dharma_type,), limit)
+    
+    def recent(self, limit=10, since=None):
+        """Return the newest results, optionally only those saved after a timestamp"""
+        if since is None:
+            return self._query("", (), limit)
+        return self._query("WHERE created_at > ?", (since,), limit)
+    
+    def count(self):
+        """Return the number of committed results"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    def close(self):
+        """Commit everything queued, stop the writer and close the store"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def __enter__(self):
+        """Use the store as a context manager that closes it on exit"""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """Close the store"""
+        self.close()
@@ -0,0 +1,304 @@
+"""
+Dharma scoring backends for Career Path Finder
+"""
+
+def hit_counts(catalog, keyword_ids, nlp_results):
+    """Return per-dharma counts of direct keyword hits, NLP key word hits and NLP key phrase hits
+    
+    These are the three signals HeuristicScorer weighs 2 / 1 / 1.5 and
+    LearnedScorer weighs with fitted coefficients.
+    """
+    keyword_hits = catalog.hits_for_keywords(keyword_ids)
+    word_hits = [0] * len(catalog.dharma_types)
+    for word in nlp_results["key_words"]:
+        for dharma_index in catalog.word_dharmas(word):
+            word_hits[dharma_index] += 1
+    phrase_hits = [0] * len(catalog.dharma_types)
+    for phrase in nlp_results["key_phrases"]:
+        for dharma_index in catalog.phrase_dharmas(phrase):
+            phrase_hits[dharma_index] += 1
+    return keyword_hits, word_hits, phrase_hits
+
+
+class HeuristicScorer:
+    """Weighted keyword scorer: direct hits, NLP words and NLP phrases"""
+    
+    name = "heuristic"
+    
+    # Keywords found in separate answers can be combined, so each answer can be matched as it arrives
+    supports_partial = True
+    
+    def __init__(self, catalog):
+        """Initialize the scorer for a compiled catalog"""
+        self.catalog = catalog
+    
+    def score(self, all_inputs, nlp_results):
+        """Calculate dharma scores using both keyword matching and NLP results"""
+        return self.complete([self.partial(all_inputs)], nlp_results)
+    
+    def partial(self, text):
+        """Find the keywords that occur in one part of a profile's text, in a single pass"""
+        return self.catalog.find_keywords(text)
+    
+    def complete(self, partials, nlp_results):
+        """Calculate dharma scores from the partials of every part of a profile and its NLP results"""
+        catalog = self.catalog
+        
+        # Score based on direct keyword matches; a keyword counts once however often it occurs
+        keyword_ids = partials[0] if len(partials) == 1 else set().union(*partials)
+        scores = [2 * hits for hits in catalog.hits_for_keywords(keyword_ids)]  # Direct matches get higher weight
+        
+        # Score based on NLP-extracted keywords and phrases
+        for word in nlp_results["key_words"]:
+            for dharma_index in catalog.word_dharmas(word):
+                scores[dharma_index] += 1
+        
+        for phrase in nlp_results["key_phrases"]:
+            for dharma_index in catalog.phrase_dharmas(phrase):
+                scores[dharma_index] += 1.5  # Phrases get higher weight than single words
+        
+        return dict(zip(catalog.dharma_types, scores))
+    
+    def score_many(self, all_inputs, nlp_results):
+        """Score a batch of combined answers and their NLP results"""
+        return [self.score(inputs, analysis) for inputs, analysis in zip(all_inputs, nlp_results)]
+
+
+class MatrixScorer(HeuristicScorer):
+    """The heuristic scorer with batches scored as one sparse matrix product in NumPy
+    
+    Each batch becomes a users x features hit matrix over the catalog's
+    keywords and the batch's distinct NLP words and phrases, multiplied by a
+    features x dharmas matrix holding the 2 / 1 / 1.5 weights. Results are
+    identical to HeuristicScorer, including which scores are ints; single
+    profiles still use the heuristic code path.
+    """
+    
+    name = "matrix"
+    
+    # Weights of a direct keyword hit, an NLP key word and an NLP key phrase
+    keyword_weight = 2
+    word_weight = 1
+    phrase_weight = 1.5
+    
+    def __init__(self, catalog):
+        """Build the keyword rows of the weight matrix once per catalog"""
+        import numpy as np
+        
+        super().__init__(catalog)
+        self.np = np
+        # Repeated entries keep a keyword listed twice under one dharma counting twice
+        self.keyword_rows = [list(dharma_indexes) for dharma_indexes in catalog.keyword_dharmas]
+    
+    def score_many(self, all_inputs, nlp_results):
+        """Score a batch of combined answers and their NLP results"""
+        return self._to_dicts(*self.score_matrix(all_inputs, nlp_results))
+    
+    def rank_many(self, all_inputs, nlp_results, count=2):
+        """Score a batch and pick each profile's top dharmas; returns (score dicts, top (dharma, score) lists)"""
+        scores, phrase_hits = self.score_matrix(all_inputs, nlp_results)
+        all_scores = self._to_dicts(scores, phrase_hits)
+        dharma_types = self.catalog.dharma_types
+        top = [
+            [(dharma_types[index], dharma_scores[dharma_types[index]]) for index in indexes]
+            for dharma_scores, indexes in zip(all_scores, self.top_k(scores, count).tolist())
+        ]
+        return all_scores, top
+    
+    def score_matrix(self, all_inputs, nlp_results):
+        """Return the users x dharmas score matrix and a mask of scores that include a phrase"""
+        np = self.np
+        catalog = self.catalog
+        keyword_count = len(catalog.keywords)
+        
+        # Features: catalog keywords, then the batch's distinct words, then its distinct phrases
+        words = {}
+        phrases = {}
+        user_rows, feature_ids = [], []
+        phrase_user_rows, phrase_ids = [], []
+        for user, (inputs, analysis) in enumerate(zip(all_inputs, nlp_results)):
+            user_features = list(catalog.find_keywords(inputs))
+            user_features.extend(keyword_count + words.setdefault(word, len(words)) for word in analysis["key_words"])
+            user_rows.extend([user] * len(user_features))
+            feature_ids.extend(user_features)
+            
+            user_phrases = [phrases.setdefault(phrase, len(phrases)) for phrase in analysis["key_phrases"]]
+            phrase_user_rows.extend([user] * len(user_phrases))
+            phrase_ids.extend(user_phrases)
+        
+        # Phrase features are numbered after every word is known
+        phrase_user_rows = np.array(phrase_user_rows, dtype=np.int64)
+        phrase_ids = np.array(phrase_ids, dtype=np.int64) + keyword_count + len(words)
+        user_rows = np.concatenate((np.array(user_rows, dtype=np.int64), phrase_user_rows))
+        feature_ids = np.concatenate((np.array(feature_ids, dtype=np.int64), phrase_ids))
+        
+        # Weight matrix rows in CSR form: the dharma indexes each feature adds to
+        rows = self.keyword_rows + [list(catalog.word_dharmas(word)) for word in words]
+        rows += [list(catalog.phrase_dharmas(phrase)) for phrase in phrases]
+        row_weights = [self.keyword_weight] * keyword_count + [self.word_weight] * len(words)
+        row_weights += [self.phrase_weight] * len(phrases)
+        
+        lengths = np.array([len(row) for row in rows], dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.array([index for row in rows for index in row], dtype=np.int64)
+        data = np.repeat(np.array(row_weights, dtype=np.float64), lengths)
+        
+        shape = (len(all_inputs), len(catalog.dharma_types))
+        scores = self._sparse_product(user_rows, feature_ids, indptr, indices, data, shape)
+        phrase_hits = self._sparse_product(phrase_user_rows, phrase_ids, indptr, indices, data, shape) > 0
+        return scores, phrase_hits
+    
+    def _sparse_product(self, user_rows, feature_ids, indptr, indices, data, shape):
+        """Multiply a 0/1 users x features matrix, given as coordinates, by a CSR features x dharmas matrix"""
+        np = self.np
+        lengths = indptr[feature_ids + 1] - indptr[feature_ids]
+        total = int(lengths.sum())
+        # Position of every weight entry the hits reach, without a Python loop
+        starts = np.repeat(indptr[feature_ids] - (np.cumsum(lengths) - lengths), lengths)
+        positions = starts + np.arange(total)
+        cells = np.repeat(user_rows, lengths) * shape[1] + indices[positions]
+        return np.bincount(cells, weights=data[positions], minlength=shape[0] * shape[1]).reshape(shape)
+    
+    def top_k(self, scores, count):
+        """Return the indexes of each row's count highest scores, ties going to the earlier dharma"""
+        np = self.np
+        dharma_count = scores.shape[1]
+        count = min(count, dharma_count)
+        # Scores are multiples of 0.5, so this integer key orders by score, then by position
+        keys = np.rint(scores * 2).astype(np.int64) * dharma_count + (dharma_count - 1 - np.arange(dharma_count))
+        if count < dharma_count:
+            candidates = np.argpartition(-keys, count - 1, axis=1)[:, :count]
+        else:
+            candidates = np.broadcast_to(np.arange(dharma_count), keys.shape)
+        order = np.argsort(-np.take_along_axis(keys, candidates, axis=1), axis=1)
+        return np.take_along_axis(candidates, order, axis=1)
+    
+    def _to_dicts(self, scores, phrase_hits):
+        """Convert score rows to the heuristic's dicts, where only scores with a phrase are floats"""
+        dharma_types = self.catalog.dharma_types
+        all_scores = [dict(zip(dharma_types, row)) for row in scores.astype(self.np.int64).tolist()]
+        for user, dharma_index in self.np.argwhere(phrase_hits).tolist():
+            all_scores[user][dharma_types[dharma_index]] = float(scores[user, dharma_index])
+        return all_scores
+
+
+class LearnedScorer(HeuristicScorer):
+    """Linear model over the heuristic's hit counts, with weights fitted offline
+    
+    The weight file, written by `career-path-finder train`, holds one weight
+    per hit count and a bias per dharma type, which replaces the hand-picked
+    default callings when nothing matched. Scoring a profile is one
+    (dharmas x 3) by 3 dot product; scores are the model's probability that
+    a dharma type is the user's calling.
+    """
+    
+    name = "learned"
+    
+    def __init__(self, catalog, weights_path=None):
+        """Load the weights, by default from data/learned_weights.npz or CAREER_FINDER_WEIGHTS"""
+        import numpy as np
+        from .data_manager import DataManager
+        
+        super().__init__(catalog)
+        self.np = np
+        weights_path = weights_path or DataManager().learned_weights_path
+        try:
+            with np.load(weights_path, allow_pickle=False) as weights:
+                self.feature_weights = weights["feature_weights"]
+                bias = dict(zip(weights["dharma_types"].tolist(), weights["dharma_bias"].tolist()))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No learned weights at {weights_path}; fit them with: career-path-finder train sessions.jsonl")
+        
+        # Dharma types added to the catalog after training get the average bias
+        default_bias = sum(bias.values()) / len(bias) if bias else 0.0
+        self.dharma_bias = np.array([bias.get(dharma_type, default_bias) for dharma_type in catalog.dharma_types])
+    
+    def features(self, keyword_ids, nlp_results):
+        """Return the dharmas x 3 matrix of hit counts for one profile"""
+        return self.np.array(hit_counts(self.catalog, keyword_ids, nlp_results), dtype=self.np.float64).T
+    
+    def complete(self, partials, nlp_results):
+        """Calculate dharma scores from the partials of every part of a profile and its NLP results"""
+        keyword_ids = partials[0] if len(partials) == 1 else set().union(*partials)
+        return self._to_dicts(self.features(keyword_ids, nlp_results)[None])[0]
+    
+    def score_many(self, all_inputs, nlp_results):
+        """Score a batch of combined answers and their NLP results with one product"""
+        features = self.np.stack([
+            self.features(self.catalog.find_keywords(inputs), analysis)
+            for inputs, analysis in zip(all_inputs, nlp_results)
+        ])
+        return self._to_dicts(features)
+    
+    def _to_dicts(self, features):
+        """Turn a users x dharmas x 3 feature array into per-user probability dicts"""
+        np = self.np
+        probabilities = 1 / (1 + np.exp(-(features @ self.feature_weights + self.dharma_bias)))
+        dharma_types = self.catalog.dharma_types
+        return [dict(zip(dharma_types, row)) for row in probabilities.tolist()]
+
+
+class TfidfScorer:
+    """Cosine similarity between user text and TF-IDF profiles of every dharma type
+    
+    Each dharma type is described by its keywords, description and careers.
+    The dharma matrix is built once; a batch of users is then scored with a
+    single sparse matrix product.
+    """
+    
+    name = "tfidf"
+    
+    # Cosine similarity of the whole text does not split into per-answer parts
+    supports_partial = False
+    
+    # Keywords are repeated so they outweigh the longer descriptive text
+    keyword_weight = 3
+    
+    def __init__(self, catalog):
+        """Fit the vectorizer on the catalog and build the dharma matrix"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        self.catalog = catalog
+        self.vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, stop_words="english")
+        self.dharma_matrix = self.vectorizer.fit_transform(
+            [self._dharma_document(data) for data in catalog.dharma_paths.values()]
+        )
+    
+    def _dharma_document(self, data):
+        """Build the text describing one dharma type"""
+        parts = list(data["keywords"]) * self.keyword_weight
+        parts.append(data["description"])
+        for career in data["careers"]:
+            parts.append(career["title"])
+            parts.append(career["description"])
+        return " ".join(parts).lower()
+    
+    def score(self, all_inputs, nlp_results):
+        """Calculate dharma scores for a single profile"""
+        return self.score_many([all_inputs], [nlp_results])[0]
+    
+    def score_many(self, all_inputs, nlp_results):
+        """Score a batch of profiles with one sparse matrix product"""
+        # Lemmas and noun chunks from the analyzer let inflected answers match
+        documents = [
+            " ".join([inputs] + analysis["key_words"] + analysis["key_phrases"])
+            for inputs, analysis in zip(all_inputs, nlp_results)
+        ]
+        similarities = (self.vectorizer.transform(documents) @ self.dharma_matrix.T).toarray()
+        
+        dharma_types = self.catalog.dharma_types
+        return [dict(zip(dharma_types, row.tolist())) for row in similarities]
+
+
+SCORERS = {
+    HeuristicScorer.name: HeuristicScorer,
+    MatrixScorer.name: MatrixScorer,
+    LearnedScorer.name: LearnedScorer,
+    TfidfScorer.name: TfidfScorer,
+}
+
+def create_scorer(name, catalog):
+    """Return the named scorer for a catalog, building it once per catalog"""
+    if name not in SCORERS:
+        raise ValueError(f"Unknown scorer '{name}'. Choose from: {', '.join(SCORERS)}")
+    return catalog.get_derived(("scorer", name), lambda: SCORERS[name](catalog))
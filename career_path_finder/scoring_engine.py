@@ -0,0 +1,329 @@
+"""
+Headless scoring engine for Career Path Finder
+"""
+
+import random
+
+from .career_ranker import CareerRanker
+from .catalog import CompiledCatalog
+from .data_manager import DataManager
+from .metrics import span, timed
+from .nlp_analyzer import NLPAnalyzer
+from .result_types import CareerSuggestion, ScoringResult
+from .scorers import create_scorer
+
+# Dharma types suggested when no keyword matched at all
+DEFAULT_DHARMAS = [("helping_others_grow", 1), ("creating_and_innovating", 1)]
+
+
+# Stages of scoring a single profile, reported to progress callbacks in this order
+SCORE_STAGES = (
+    ("analyze", "Analyzing your responses"),
+    ("score", "Weighing your true callings"),
+    ("suggest", "Finding career paths"),
+)
+
+# Free-text answer fields, in the order combine_inputs joins them
+ANSWER_FIELDS = ("passions", "childhood_memories", "dream_impact")
+
+# Profile fields that hold a string or a list of strings
+TEXT_FIELDS = ANSWER_FIELDS + ("skills", "qualifications")
+
+def field_values(user_data, field):
+    """List the strings of a profile field; a single string is one value"""
+    values = user_data.get(field) or []
+    return [values] if isinstance(values, str) else list(values)
+
+def validate_profile(user_data):
+    """Raise ValueError unless the profile is an object whose text fields are strings or lists of strings"""
+    if not isinstance(user_data, dict):
+        raise ValueError("profile must be a JSON object")
+    for field in TEXT_FIELDS:
+        values = user_data.get(field)
+        if values is None or isinstance(values, str):
+            continue
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"{field} must be a string or a list of strings")
+
+def combine_inputs(user_data):
+    """Combine the free-text answers of a profile into one lowercased string"""
+    return " ".join(value for field in ANSWER_FIELDS for value in field_values(user_data, field)).lower()
+
+
+class ScoringEngine:
+    """Class for scoring user profiles against the dharma catalog without any UI"""
+    
+    def __init__(self, dharma_paths=None, nlp_analyzer=None, seed=None, scorer="heuristic", fuzzy_skills=True,
+                 catalog=None, top_careers=None):
+        """Initialize the engine with optional catalog, analyzer, random seed and scoring backend
+        
+        Without dharma_paths or a compiled catalog, the bundled catalog is
+        loaded through the DataManager's compiled cache; dharma_paths are
+        compiled with the bundled guidance data. By default every
+        career of the top dharma types is suggested; top_careers=K instead
+        suggests the K most relevant careers from the whole catalog, ranked.
+        """
+        if top_careers is not None and top_careers < 1:
+            raise ValueError(f"top_careers must be at least 1, got {top_careers}")
+        if catalog is None:
+            if dharma_paths is None:
+                catalog = DataManager().load_compiled_catalog()
+            else:
+                catalog = CompiledCatalog(dharma_paths, DataManager().load_guidance_data()).precompute()
+        if nlp_analyzer is None:
+            nlp_analyzer = NLPAnalyzer()
+        
+        self.scorer_name = scorer
+        # The catalog and the scorer built on it, replaced together by swap_catalog
+        self._snapshot = (catalog, create_scorer(scorer, catalog))
+        self.nlp_analyzer = nlp_analyzer
+        self.rng = random.Random(seed)
+        self.fuzzy_skills = fuzzy_skills
+        self.top_careers = top_careers
+    
+    @property
+    def catalog(self):
+        """The compiled catalog profiles are currently scored against"""
+        return self._snapshot[0]
+    
+    @property
+    def scorer(self):
+        """The scoring backend built on the current catalog"""
+        return self._snapshot[1]
+    
+    @property
+    def dharma_paths(self):
+        """The raw dharma data behind the compiled catalog"""
+        return self.catalog.dharma_paths
+    
+    def snapshot(self):
+        """Return the current (catalog, scorer) pair; scoring with it stays consistent across swap_catalog"""
+        return self._snapshot
+    
+    @timed("engine.swap_catalog")
+    def swap_catalog(self, catalog):
+        """Start scoring against a newly compiled catalog
+        
+        The new scorer and the indexes suggestions use are built first, then
+        the catalog and scorer are replaced together in one assignment.
+        Profiles already being scored finish with the previous pair.
+        """
+        scorer = create_scorer(self.scorer_name, catalog)
+        catalog.fuzzy_matcher()
+        if self.top_careers is not None:
+            catalog.get_derived(("career_ranker",), lambda: CareerRanker(catalog))
+        self._snapshot = (catalog, scorer)
+    
+    @timed("engine.score_dharmas")
+    def score_dharmas(self, all_inputs, nlp_results, scorer=None):
+        """Calculate dharma scores with the configured scoring backend, or the given scorer"""
+        return (scorer or self.scorer).score(all_inputs, nlp_results)
+    
+    def top_dharmas(self, dharma_scores, count=2, catalog=None):
+        """Return the highest scoring dharma types, falling back to defaults"""
+        return self._or_default_dharmas(sorted(dharma_scores.items(), key=lambda x: x[1], reverse=True)[:count], catalog)
+    
+    def _or_default_dharmas(self, top_dharmas, catalog=None):
+        """Replace a ranking without any matches by the default dharma types"""
+        dharma_paths = (catalog or self.catalog).dharma_paths
+        # If no clear matches, use some defaults
+        if not top_dharmas or top_dharmas[0][1] == 0:
+            top_dharmas = [item for item in DEFAULT_DHARMAS if item[0] in dharma_paths]
+        
+        return top_dharmas
+    
+    @timed("engine.suggest_careers")
+    def suggest_careers(self, top_dharmas, skills, dharma_scores=None, nlp_results=None, catalog=None):
+        """Prepare career suggestions based on true callings
+        
+        With top_careers set and the profile's dharma scores and NLP results
+        given, the suggestions are instead the top_careers most relevant
+        careers across the catalog, best first, each with its relevance.
+        catalog defaults to the current one.
+        """
+        catalog = catalog or self.catalog
+        career_suggestions = []
+        
+        # Find the keywords in each skill once rather than once per career
+        skill_keywords = [(skill, skill.lower(), catalog.find_keywords(skill.lower())) for skill in skills]
+        
+        # Typo-tolerant matches of each skill against keywords and career titles
+        if self.fuzzy_skills:
+            matcher = catalog.fuzzy_matcher()
+            fuzzy_matches = [matcher.match(skill) for skill in skills]
+        else:
+            fuzzy_matches = [(frozenset(), frozenset())] * len(skills)
+        
+        if self.top_careers is not None and dharma_scores is not None:
+            ranker = catalog.get_derived(("career_ranker",), lambda: CareerRanker(catalog))
+            selected = ranker.rank(dharma_scores, skill_keywords, fuzzy_matches, nlp_results, self.top_careers,
+                                   fallback_dharmas=[dharma_type for dharma_type, _ in top_dharmas])
+        else:
+            # Every career of the top dharma types, in catalog order
+            selected = [
+                (None, catalog.dharma_index[dharma_type], career_index)
+                for dharma_type, _ in top_dharmas
+                for career_index in range(len(catalog.dharma_paths[dharma_type]["careers"]))
+            ]
+        
+        for relevance, dharma_index, career_index in selected:
+            dharma_type = catalog.dharma_types[dharma_index]
+            dharma_data = catalog.dharma_paths[dharma_type]
+            dharma_keyword_ids = catalog.dharma_keyword_ids[dharma_index]
+            career = dharma_data["careers"][career_index]
+            
+            # Check if user already has relevant skills
+            skill_relevance = []
+            
+            title_lower = catalog.career_titles_lower[dharma_index][career_index]
+            for (skill, skill_lower, keyword_ids), (fuzzy_keyword_ids, fuzzy_careers) in zip(skill_keywords, fuzzy_matches):
+                # Check if skill is relevant to this career
+                if (title_lower in skill_lower or not keyword_ids.isdisjoint(dharma_keyword_ids)
+                        or (dharma_index, career_index) in fuzzy_careers
+                        or not fuzzy_keyword_ids.isdisjoint(dharma_keyword_ids)):
+                    skill_relevance.append(skill)
+            
+            # Generate personalized alignment explanation from the career's compiled pool
+            alignments = catalog.career_alignments[dharma_index][career_index]
+            alignment = self.rng.choice(alignments) if alignments else ""
+            
+            # Skill development suggestions only for careers without relevant skills
+            if skill_relevance:
+                suggested_skills = ()
+            else:
+                suggested_skills = catalog.career_suggested_skills[dharma_index][career_index]
+            
+            career_suggestions.append(CareerSuggestion(
+                career, dharma_type, dharma_data["description"],
+                tuple(skill_relevance) if skill_relevance else (),
+                suggested_skills, alignment, relevance
+            ))
+        
+        return career_suggestions
+    
+    @timed("engine.similar_careers")
+    def similar_careers(self, title, count=5):
+        """Return up to count careers most like the one with this title, best first
+        
+        Each is a dict with the career's title, description, dharma type and
+        cosine similarity. Raises KeyError if no career has the title.
+        """
+        catalog = self.catalog
+        similar = []
+        for similarity, dharma_index, career_index in catalog.similarity_index().similar(title, count):
+            dharma_type = catalog.dharma_types[dharma_index]
+            career = catalog.dharma_paths[dharma_type]["careers"][career_index]
+            similar.append({
+                "title": career["title"],
+                "description": career["description"],
+                "dharma_type": dharma_type,
+                "similarity": similarity
+            })
+        return similar
+    
+    @timed("engine.score")
+    def score(self, user_data, progress=None):
+        """Identify true calling and suggest career paths for a single profile
+        
+        progress, if given, is called with each stage name from SCORE_STAGES
+        as that stage finishes.
+        """
+        validate_profile(user_data)
+        
+        # The whole profile is scored against one catalog even if it is swapped meanwhile
+        catalog, scorer = self._snapshot
+        
+        # Combine all user inputs to identify themes
+        all_inputs = combine_inputs(user_data)
+        
+        # Use NLP to extract key themes from user responses
+        nlp_results = self.nlp_analyzer.analyze_text(all_inputs)
+        if progress:
+            progress("analyze")
+        
+        dharma_scores = self.score_dharmas(all_inputs, nlp_results, scorer)
+        if progress:
+            progress("score")
+        
+        results = self.build_results(user_data, nlp_results, dharma_scores, catalog=catalog)
+        if progress:
+            progress("suggest")
+        return results
+    
+    def score_many(self, profiles, batch_size=64, n_process=1):
+        """Score many profiles, analyzing their text in batches; yields results in input order"""
+        catalog, scorer = self._snapshot
+        profiles = list(profiles)
+        for user_data in profiles:
+            validate_profile(user_data)
+        all_inputs = [combine_inputs(user_data) for user_data in profiles]
+        with span("engine.score_many.analyze"):
+            nlp_results = list(self.nlp_analyzer.analyze_many(all_inputs, batch_size=batch_size, n_process=n_process))
+        
+        # Score the whole batch at once so vectorized backends can use one matrix product
+        with span("engine.score_many.score_dharmas"):
+            if hasattr(scorer, "rank_many"):
+                # The backend also ranks the batch, so build_results does not sort again
+                all_scores, all_top = scorer.rank_many(all_inputs, nlp_results)
+            else:
+                all_scores = scorer.score_many(all_inputs, nlp_results)
+                all_top = [None] * len(all_scores)
+        
+        for user_data, analysis, dharma_scores, top_dharmas in zip(profiles, nlp_results, all_scores, all_top):
+            yield self.build_results(user_data, analysis, dharma_scores, top_dharmas, catalog)
+    
+    def build_results(self, user_data, nlp_results, dharma_scores, top_dharmas=None, catalog=None):
+        """Turn dharma scores into true callings, career suggestions and insights
+        
+        top_dharmas, if the scoring backend already ranked the scores, is the
+        list of (dharma type, score) pairs that top_dharmas() would return
+        before falling back to defaults. catalog must be the one the scores
+        were computed on; it defaults to the current one.
+        """
+        catalog = catalog or self.catalog
+        if top_dharmas is None:
+            top_dharmas = self.top_dharmas(dharma_scores, catalog=catalog)
+        else:
+            top_dharmas = self._or_default_dharmas(top_dharmas, catalog)
+        career_suggestions = self.suggest_careers(top_dharmas, field_values(user_data, "skills"), dharma_scores, nlp_results,
+                                                  catalog)
+        
+        # Get personalized messages for the top dharma types
+        personalized_insights = []
+        for dharma_type, _ in top_dharmas:
+            messages = catalog.dharma_messages[catalog.dharma_index[dharma_type]]
+            if messages:
+                personalized_insights.append(self.rng.choice(messages))
+        
+        return ScoringResult(
+            true_callings=[catalog.dharma_paths[dharma_type]["description"] for dharma_type, _ in top_dharmas],
+            top_dharmas=[dharma_type for dharma_type, _ in top_dharmas],
+            dharma_scores=dharma_scores,
+            career_suggestions=career_suggestions,
+            personalized_insights=personalized_insights,
+            nlp_keywords=nlp_results["key_words"][:5]  # Top 5 keywords for display
+        )
+
+
+_default_engine = None
+
+def get_default_engine():
+    """Return a shared engine built from the bundled catalog"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = ScoringEngine()
+    return _default_engine
+
+
+def similar_careers(title, count=5, engine=None):
+    """Return up to count careers most like the one with this title; see ScoringEngine.similar_careers"""
+    if engine is None:
+        engine = get_default_engine()
+    return engine.similar_careers(title, count)
+
+
+def score_profile(user_data, engine=None):
+    """Score a single user profile and return its ScoringResult; to_dict() gives the plain dict"""
+    if engine is None:
+        engine = get_default_engine()
+    return engine.score(user_data)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP scoring service for Career Path Finder
+
+Endpoints:
+    GET  /health        -> {"status": "ok"}
+    GET  /metrics       -> stage timings and counters in Prometheus text format
+    POST /score         profile object -> results object
+    POST /score/batch   {"profiles": [...]} -> {"results": [...]}
+"""
+
+import json
+import signal
+import asyncio
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from rich.console import Console
+
+from . import metrics
+from .main import non_negative_int, positive_int
+from .scoring_engine import validate_profile
+from .workers import build_engine, collect, create_worker_pool, score_in_worker, score_many_in_worker
+
+# Initialize Rich console
+console = Console()
+
+class HTTPError(Exception):
+    """Error that maps directly to an HTTP response"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class ScoringServer:
+    """Minimal HTTP/1.1 server that scores profiles on a pool of warm workers"""
+    
+    # Largest request body accepted, in bytes
+    max_body_size = 10 * 1024 * 1024
+    
+    def __init__(self, host="127.0.0.1", port=8080, workers=None, trace_path=None, metrics_path=None, **engine_options):
+        """Initialize the server; workers=0 scores on threads in this process
+        
+        trace_path and metrics_path receive a JSON trace and a Prometheus
+        text file on shutdown; /metrics serves the same counters live.
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.trace_path = trace_path
+        self.metrics_path = metrics_path
+        self.engine_options = engine_options
+        self.executor = None
+        self._score = None
+        self._score_many = None
+        self._unpack = None
+        self.routes = {
+            "/health": ("GET", self.handle_health),
+            "/metrics": ("GET", self.handle_metrics),
+            "/score": ("POST", self.handle_score),
+            "/score/batch": ("POST", self.handle_score_batch),
+        }
+    
+    def start_executor(self):
+        """Create the worker pool holding the NLP model and catalog"""
+        if self.workers == 0:
+            engine = build_engine(**self.engine_options)
+            engine.nlp_analyzer.nlp  # Load spaCy before serving
+            self.executor = ThreadPoolExecutor()
+            self._score = lambda profile: engine.score(profile).to_dict()
+            self._score_many = lambda profiles: [results.to_dict() for results in engine.score_many(profiles)]
+            self._unpack = lambda result: result
+        else:
+            self.executor = create_worker_pool(self.workers, **self.engine_options)
+            self._score = score_in_worker
+            self._score_many = score_many_in_worker
+            self._unpack = collect
+    
+    async def run_in_executor(self, function, *args):
+        """Run CPU-bound scoring off the event loop"""
+        loop = asyncio.get_running_loop()
+        return self._unpack(await loop.run_in_executor(self.executor, functools.partial(function, *args)))
+    
+    async def handle_health(self, body):
+        """Report that the service is up"""
+        return {"status": "ok"}
+    
+    async def handle_metrics(self, body):
+        """Expose stage timings and counters for scraping"""
+        return metrics.registry.prometheus()
+    
+    async def handle_score(self, body):
+        """Score a single profile"""
+        profile = self._parse_json(body)
+        self._validate(profile)
+        return await self.run_in_executor(self._score, profile)
+    
+    async def handle_score_batch(self, body):
+        """Score a list of profiles in one request"""
+        payload = self._parse_json(body)
+        profiles = payload.get("profiles") if isinstance(payload, dict) else None
+        if not isinstance(profiles, list) or not all(isinstance(profile, dict) for profile in profiles):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be {\"profiles\": [objects]}")
+        for index, profile in enumerate(profiles):
+            self._validate(profile, f"profiles[{index}]: ")
+        return {"results": await self.run_in_executor(self._score_many, profiles)}
+    
+    def _validate(self, profile, prefix=""):
+        """Reject a profile the engine cannot score"""
+        try:
+            validate_profile(profile)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{prefix}{str(e)}")
+    
+    def _parse_json(self, body):
+        """Decode a JSON request body"""
+        try:
+            return json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {str(e)}")
+    
+    async def dispatch(self, method, path, body):
+        """Route a request and return (status, payload)"""
+        route = self.routes.get(path.split("?", 1)[0])
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+        if method != route[0]:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Use {route[0]}"}
+        metrics.increment("server.requests")
+        try:
+            with metrics.span(f"server.{path.strip('/').replace('/', '_')}"):
+                return HTTPStatus.OK, await route[1](body)
+        except HTTPError as e:
+            metrics.increment("server.client_errors")
+            return e.status, {"error": e.message}
+        except Exception as e:
+            metrics.increment("server.server_errors")
+            console.print(f"[bold red]Error handling {method} {path}: {str(e)}[/bold red]")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+    
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection, honouring keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._write_response(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}, False)
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                
+                if "transfer-encoding" in headers:
+                    # The body's length is unknown, so the connection cannot be read past it
+                    await self._write_response(writer, HTTPStatus.NOT_IMPLEMENTED,
+                                               {"error": "Transfer-Encoding is not supported; send a Content-Length"}, False)
+                    break
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > self.max_body_size:
+                    await self._write_response(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST,
+                                               {"error": "Invalid Content-Length"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                
+                status, payload = await self.dispatch(method.upper(), path, body)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _write_response(self, writer, status, payload, keep_alive):
+        """Write a JSON response, or plain text if the payload is a string"""
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        else:
+            body = json.dumps(payload).encode("utf-8")
+            content_type = "application/json"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+    
+    def serve_forever(self):
+        """Start the workers and serve until interrupted"""
+        console.print("[cyan]Loading NLP model and dharma catalog...[/cyan]")
+        self.start_executor()
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = loop.run_until_complete(asyncio.start_server(self.handle_connection, self.host, self.port))
+        try:
+            loop.add_signal_handler(signal.SIGTERM, loop.stop)
+        except NotImplementedError:
+            pass  # Signal handlers are unavailable on Windows event loops
+        console.print(f"[green]Career Path Finder scoring service listening on http://{self.host}:{self.port}[/green]")
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Shutting down...[/yellow]")
+        finally:
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+            self.executor.shutdown()
+            metrics.export(self.trace_path, self.metrics_path)
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(prog="career-path-finder-server", description="Career Path Finder HTTP scoring service")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--workers", type=non_negative_int, default=None, help="Scoring worker processes (default: one per core, 0 for threads in this process)")
+    parser.add_argument("--scorer", choices=("heuristic", "matrix", "learned", "tfidf"), default="heuristic", help="Dharma scoring backend")
+    parser.add_argument("--spacy-model", default=None, help="spaCy pipeline to use, or 'none' for the simple analyzer")
+    parser.add_argument("--cache-db", default=None, help="SQLite file caching text analysis, shared by the workers")
+    parser.add_argument("--top-careers", type=positive_int, default=None, help="Suggest the K most relevant careers across the catalog")
+    parser.add_argument("--watch-catalog", action="store_true", help="Reload the dharma catalog in every worker when its data files change")
+    parser.add_argument("--metrics", action="store_true", help="Record stage timings and counters (served at /metrics)")
+    parser.add_argument("--trace-json", default=None, help="Write a JSON trace of every stage on shutdown (implies --metrics)")
+    parser.add_argument("--metrics-file", default=None, help="Write Prometheus metrics to this file on shutdown (implies --metrics)")
+    return parser
+
+def main(argv=None):
+    """Entry point for the scoring service"""
+    args = build_parser().parse_args(argv)
+    if args.metrics or args.trace_json or args.metrics_file:
+        metrics.enable(trace=bool(args.trace_json))
+    ScoringServer(args.host, args.port, args.workers, trace_path=args.trace_json, metrics_path=args.metrics_file,
+                  scorer=args.scorer, spacy_model=args.spacy_model, cache_db=args.cache_db,
+                  top_careers=args.top_careers, watch_catalog=args.watch_catalog).serve_forever()
+
+if __name__ == "__main__":
+    main()
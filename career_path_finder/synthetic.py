@@ -0,0 +1,127 @@
+"""
+Synthetic profile and catalog generation for load testing Career Path Finder
+"""
+
+import json
+import random
+
+from .data_manager import DataManager
+
+SYLLABLES = ["ka", "lo", "mi", "re", "tu", "sa", "ne", "vo", "di", "pa", "sho", "ler", "ing", "ton", "ver", "gra"]
+
+# Everyday words that fill answers without matching any keyword
+FILLER_WORDS = [
+    "i", "love", "always", "really", "enjoy", "when", "was", "little", "would", "spend", "hours",
+    "with", "my", "friends", "family", "the", "world", "people", "time", "things", "new", "every",
+    "day", "school", "home", "outside", "games", "books", "music", "sports", "animals", "nature",
+    "reading", "drawing", "talking", "walking", "cooking", "travel", "stories", "ideas", "better"
+]
+
+# Short answers many real users give, reused to exercise caches
+COMMON_ANSWERS = [
+    "reading", "helping people", "playing outside", "drawing", "building things", "music",
+    "spending time with family", "solving puzzles", "teaching others", "sports"
+]
+
+SKILL_WORDS = ["communication", "python", "writing", "leadership", "design", "teaching", "analysis",
+               "planning", "mentoring", "research", "sales", "customer service", "project management"]
+
+class SyntheticDataGenerator:
+    """Seeded generator of user_data-shaped profiles and dharma_data.json-shaped catalogs
+    
+    overlap is the share of answer words drawn from the catalog's keywords
+    rather than filler text. duplicate_rate is the share of answers copied
+    verbatim from a small pool of common answers.
+    """
+    
+    def __init__(self, seed=0, overlap=0.3, duplicate_rate=0.1, vocabulary_size=5000):
+        """Initialize the generator"""
+        self.rng = random.Random(seed)
+        self.overlap = overlap
+        self.duplicate_rate = duplicate_rate
+        self.vocabulary = self._pseudo_words(vocabulary_size)
+    
+    def _pseudo_words(self, size):
+        """Build a deterministic vocabulary of pseudo-words"""
+        words = set()
+        while len(words) < size:
+            words.add("".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4))))
+        return sorted(words)
+    
+    def catalog(self, dharmas=8, careers=6, keywords=9, include_base=True):
+        """Build a catalog with the given number of dharma types, careers and keywords each
+        
+        The bundled dharma types come first when include_base is set, so
+        scaled catalogs still contain realistic callings.
+        """
+        rng = self.rng
+        catalog = {}
+        if include_base:
+            for dharma_type, data in DataManager()._get_default_dharma_data().items():
+                if len(catalog) >= dharmas:
+                    break
+                catalog[dharma_type] = data
+        
+        while len(catalog) < dharmas:
+            index = len(catalog)
+            catalog[f"calling_{index}"] = {
+                "keywords": [" ".join(rng.sample(self.vocabulary, rng.choice((1, 1, 2)))) for _ in range(keywords)],
+                "description": "Your true calling is to " + " ".join(rng.sample(self.vocabulary, 15)) + ".",
+                "careers": [
+                    {"title": " ".join(rng.sample(self.vocabulary, 2)).title(),
+                     "description": " ".join(rng.sample(self.vocabulary, 10)).capitalize()}
+                    for _ in range(careers)
+                ]
+            }
+        return catalog
+    
+    def _answer(self, keywords, words):
+        """Build one free-text answer of about `words` words"""
+        rng = self.rng
+        if rng.random() < self.duplicate_rate:
+            return rng.choice(COMMON_ANSWERS)
+        return " ".join(
+            rng.choice(keywords) if keywords and rng.random() < self.overlap else rng.choice(FILLER_WORDS)
+            for _ in range(words)
+        )
+    
+    def profiles(self, count, catalog=None, words_per_answer=12, labeled=False):
+        """Yield `count` profiles whose answers draw keywords from the catalog
+        
+        With labeled set, each profile leans towards a random dharma type,
+        drawing about half of its keywords from that type, and records it as
+        its confirmed "calling" for training learned weights.
+        """
+        rng = self.rng
+        catalog = catalog if catalog is not None else DataManager()._get_default_dharma_data()
+        keywords = [keyword for data in catalog.values() for keyword in data["keywords"]]
+        titles = [career["title"].lower() for data in catalog.values() for career in data["careers"]]
+        dharma_types = list(catalog)
+        
+        for index in range(count):
+            answer_keywords = keywords
+            if labeled:
+                calling = rng.choice(dharma_types)
+                own_keywords = catalog[calling]["keywords"]
+                answer_keywords = own_keywords * max(1, len(keywords) // (len(own_keywords) or 1)) + keywords
+            profile = {
+                "name": f"user_{index}",
+                "passions": [self._answer(answer_keywords, words_per_answer) for _ in range(3)],
+                "childhood_memories": [self._answer(answer_keywords, words_per_answer) for _ in range(3)],
+                "skills": [rng.choice(titles) if rng.random() < self.overlap else rng.choice(SKILL_WORDS)
+                           for _ in range(rng.randint(1, 5))],
+                "qualifications": rng.sample(["BA", "BSc", "MSc", "PhD", "MBA", "Certificate"], rng.randint(0, 2)),
+                "dream_impact": self._answer(answer_keywords, words_per_answer)
+            }
+            if labeled:
+                profile["calling"] = calling
+            yield profile
+
+def write_jsonl(path, items):
+    """Stream items to a JSONL file and return how many were written"""
+    count = 0
+    with open(path, 'w') as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+            count += 1
+    return count
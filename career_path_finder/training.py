@@ -0,0 +1,168 @@
+"""
+Offline training of learned scoring weights for Career Path Finder
+"""
+
+import os
+import random
+import tempfile
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+from .batch import read_profiles
+from .data_manager import DataManager
+from .metrics import span
+from .scorers import hit_counts
+from .scoring_engine import combine_inputs
+from .workers import build_engine
+
+# Initialize Rich console on stderr so reports do not mix with piped output
+console = Console(stderr=True)
+
+# Profile field holding the dharma type the user confirmed as their calling
+LABEL_FIELD = "calling"
+
+# The hit counts the model weighs, in feature order
+FEATURE_NAMES = ("keyword_hits", "word_hits", "phrase_hits")
+
+def read_labeled_sessions(input_path, dharma_types):
+    """Return (profiles, calling indexes, skipped count) from a JSONL file of labeled sessions
+    
+    Lines that are not JSON objects, or whose calling is not a dharma type
+    of the catalog, are skipped.
+    """
+    dharma_index = {dharma_type: index for index, dharma_type in enumerate(dharma_types)}
+    profiles = []
+    callings = []
+    skipped = 0
+    with open(input_path, 'r') as input_file:
+        for _, profile in read_profiles(input_file):
+            if isinstance(profile, dict) and profile.get(LABEL_FIELD) in dharma_index:
+                profiles.append(profile)
+                callings.append(dharma_index[profile[LABEL_FIELD]])
+            else:
+                skipped += 1
+    return profiles, callings, skipped
+
+def build_features(catalog, all_inputs, nlp_results):
+    """Return the sessions x dharmas x 3 array of hit counts the learned scorer weighs"""
+    import numpy as np
+    
+    counts = [hit_counts(catalog, catalog.find_keywords(inputs), analysis)
+              for inputs, analysis in zip(all_inputs, nlp_results)]
+    return np.array(counts, dtype=np.float64).reshape(len(counts), len(FEATURE_NAMES), -1).transpose(0, 2, 1)
+
+def fit_weights(features, callings, regularization=1.0):
+    """Fit the weight of each hit count and the bias of each dharma type; returns (feature weights, dharma bias)
+    
+    Every (session, dharma type) pair is one example, labeled by whether
+    that type is the session's confirmed calling, so the weights are shared
+    by all dharma types and a catalog needs few sessions per type.
+    """
+    import numpy as np
+    from scipy import sparse
+    from sklearn.linear_model import LogisticRegression
+    
+    sessions, dharmas, feature_count = features.shape
+    pairs = sessions * dharmas
+    # One indicator column per dharma type gives each its own bias
+    indicators = sparse.csr_matrix((np.ones(pairs), (np.arange(pairs), np.tile(np.arange(dharmas), sessions))),
+                                   shape=(pairs, dharmas))
+    examples = sparse.hstack([sparse.csr_matrix(features.reshape(pairs, feature_count)), indicators]).tocsr()
+    labels = np.zeros(pairs)
+    labels[np.arange(sessions) * dharmas + np.asarray(callings)] = 1
+    
+    model = LogisticRegression(C=regularization, max_iter=1000)
+    model.fit(examples, labels)
+    coefficients = model.coef_[0]
+    return coefficients[:feature_count], coefficients[feature_count:] + model.intercept_[0]
+
+def save_weights(path, dharma_types, feature_weights, dharma_bias):
+    """Atomically write a weight file for LearnedScorer"""
+    import numpy as np
+    
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, feature_weights=np.asarray(feature_weights, dtype=np.float64),
+                     dharma_bias=np.asarray(dharma_bias, dtype=np.float64),
+                     dharma_types=np.array(dharma_types), feature_names=np.array(FEATURE_NAMES))
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def train_from_file(input_path, output_path=None, holdout=0.2, regularization=1.0, seed=0, spacy_model=None,
+                    batch_size=64, n_process=1):
+    """Fit learned weights on labeled sessions, measure them on a holdout and save them
+    
+    The weights are fitted on the sessions outside the holdout, which is
+    used to compare their top-1 accuracy with the heuristic's. Returns a
+    report dict; nothing is written unless at least one session was usable.
+    """
+    import numpy as np
+    
+    engine = build_engine(scorer="heuristic", spacy_model=spacy_model)
+    catalog = engine.catalog
+    output_path = Path(output_path) if output_path else DataManager().learned_weights_path
+    
+    profiles, callings, skipped = read_labeled_sessions(input_path, catalog.dharma_types)
+    report = {"sessions": len(profiles), "skipped": skipped, "held_out": 0, "heuristic_accuracy": None,
+              "learned_accuracy": None, "feature_weights": None, "output": str(output_path), "trained": False}
+    if not profiles:
+        return report
+    
+    all_inputs = [combine_inputs(profile) for profile in profiles]
+    with span("train.analyze"):
+        nlp_results = list(engine.nlp_analyzer.analyze_many(all_inputs, batch_size=batch_size, n_process=n_process))
+    features = build_features(catalog, all_inputs, nlp_results)
+    callings = np.array(callings)
+    
+    order = list(range(len(profiles)))
+    random.Random(seed).shuffle(order)
+    held_out = int(len(order) * holdout)
+    # Keep at least one session to train on
+    held_out = min(held_out, len(order) - 1)
+    test, train = np.array(order[:held_out], dtype=np.int64), np.array(order[held_out:], dtype=np.int64)
+    
+    with span("train.fit"):
+        feature_weights, dharma_bias = fit_weights(features[train], callings[train], regularization)
+    
+    if held_out:
+        # Top choices the way ScoringEngine.top_dharmas picks them; ties go to the earlier dharma type
+        heuristic = [engine.top_dharmas(engine.scorer.score(all_inputs[index], nlp_results[index]))[0][0]
+                     for index in test.tolist()]
+        heuristic_hits = sum(catalog.dharma_index[dharma_type] == calling
+                             for dharma_type, calling in zip(heuristic, callings[test].tolist()))
+        learned = np.argmax(features[test] @ feature_weights + dharma_bias, axis=1)
+        report["heuristic_accuracy"] = heuristic_hits / held_out
+        report["learned_accuracy"] = float(np.mean(learned == callings[test]))
+    
+    save_weights(output_path, catalog.dharma_types, feature_weights, dharma_bias)
+    report.update(held_out=held_out, trained=True,
+                  feature_weights=dict(zip(FEATURE_NAMES, feature_weights.tolist())))
+    return report
+
+def print_training_report(report):
+    """Display the outcome of a training run as a table"""
+    if not report["trained"]:
+        console.print(f"[bold red]No usable labeled sessions ({report['skipped']} skipped); "
+                      f"each profile needs its confirmed dharma type in \"{LABEL_FIELD}\".[/bold red]")
+        return
+    
+    table = Table(title="Learned Scoring Weights")
+    table.add_column("Measure")
+    table.add_column("Value", justify="right")
+    table.add_row("Sessions", str(report["sessions"]))
+    table.add_row("Skipped", str(report["skipped"]))
+    table.add_row("Held out", str(report["held_out"]))
+    if report["held_out"]:
+        table.add_row("Heuristic top-1 accuracy", f"{report['heuristic_accuracy']:.1%}")
+        table.add_row("Learned top-1 accuracy", f"{report['learned_accuracy']:.1%}")
+    for name, weight in report["feature_weights"].items():
+        table.add_row(f"Weight of {name.replace('_', ' ')}", f"{weight:.3f}")
+    console.print(table)
+    console.print(f"[green]Saved weights to {report['output']}; score with --scorer learned[/green]")
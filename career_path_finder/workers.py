@@ -0,0 +1,73 @@
+"""
+Worker process helpers for Career Path Finder
+"""
+
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from . import metrics
+from .analysis_cache import AnalysisCache
+from .catalog_watcher import CatalogWatcher
+from .nlp_analyzer import NLPAnalyzer
+from .scoring_engine import ScoringEngine
+
+# Engine owned by the current worker process, built once by init_worker
+_worker_engine = None
+
+def build_engine(scorer="heuristic", spacy_model=None, fuzzy_skills=True, seed=None, cache_db=None, top_careers=None,
+                 watch_catalog=False):
+    """Build a scoring engine from command line style options
+    
+    With watch_catalog, a CatalogWatcher thread in this process swaps in the
+    catalog whenever the data files change.
+    """
+    cache = AnalysisCache(db_path=cache_db) if cache_db else None
+    engine = ScoringEngine(nlp_analyzer=NLPAnalyzer(model_name=spacy_model, cache=cache), seed=seed,
+                           scorer=scorer, fuzzy_skills=fuzzy_skills, top_careers=top_careers)
+    if watch_catalog:
+        CatalogWatcher(engine).start()
+    return engine
+
+def init_worker(engine_options, metrics_enabled=False):
+    """Build the worker's engine and load its NLP model before any work arrives"""
+    global _worker_engine
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if metrics_enabled:
+        metrics.enable()
+    _worker_engine = build_engine(**engine_options)
+    _worker_engine.nlp_analyzer.nlp  # Load spaCy now rather than on the first request
+
+def worker_ready():
+    """Return the worker's process id once its engine is built"""
+    return os.getpid()
+
+def _with_metrics(result):
+    """Pair a result with the worker's metrics recorded since the last task"""
+    return result, metrics.registry.drain() if metrics.is_enabled() else None
+
+def collect(output):
+    """Unpack a worker's (result, metrics) pair, merging the metrics into this process"""
+    result, snapshot = output
+    if snapshot is not None:
+        metrics.registry.merge(snapshot)
+    return result
+
+def score_in_worker(profile):
+    """Score a single profile with the worker's engine; unpack the output with collect()"""
+    return _with_metrics(_worker_engine.score(profile).to_dict())
+
+def score_many_in_worker(profiles):
+    """Score a list of profiles with the worker's engine; unpack the output with collect()"""
+    return _with_metrics([results.to_dict() for results in _worker_engine.score_many(profiles)])
+
+def create_worker_pool(workers=None, **engine_options):
+    """Start a process pool whose workers each keep a warm engine"""
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                               initargs=(engine_options, metrics.is_enabled()))
+    # Start every worker now so the first requests do not pay for model loading
+    for future in [pool.submit(worker_ready) for _ in range(workers)]:
+        future.result()
+    return pool
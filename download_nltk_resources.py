@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
 """
 Download NLTK resources needed for Career Path Finder
+
+Run with --dir to pre-stage the corpora into a directory (for example
+data/nltk_data) that can be copied to air-gapped hosts. The application
+searches data/nltk_data and $CAREER_FINDER_NLTK_DATA before the NLTK
+defaults, and never downloads when CAREER_FINDER_NLTK_OFFLINE=1.
 """
 
-import nltk
 import os
 import sys
+import argparse
 from rich.console import Console
 from rich.panel import Panel
 
+from career_path_finder.nltk_resources import NLTKResourceManager, NLTK_REQUIREMENTS
+
 console = Console()
 
 def main():
+    parser = argparse.ArgumentParser(description="Download NLTK resources for Career Path Finder")
+    parser.add_argument("--dir", default=None, help="Directory to download into (default: ~/nltk_data)")
+    parser.add_argument("--force", action="store_true", help="Download even if a resource is already installed")
+    args = parser.parse_args()
+    
     console.print(Panel.fit(
         "[bold cyan]Career Path Finder - NLTK Resource Downloader[/bold cyan]\n\n"
         "This script will download the required NLTK resources for the Career Path Finder application.",
@@ -20,22 +32,27 @@ def main():
     ))
     
     # Create NLTK data directory if it doesn't exist
-    nltk_data_dir = os.path.join(os.path.expanduser("~"), "nltk_data")
+    nltk_data_dir = args.dir or os.path.join(os.path.expanduser("~"), "nltk_data")
     if not os.path.exists(nltk_data_dir):
         os.makedirs(nltk_data_dir)
         console.print(f"[green]Created NLTK data directory: {nltk_data_dir}[/green]")
     
-    # Download required resources
-    resources = ['punkt', 'stopwords', 'wordnet']
-    for resource in resources:
-        console.print(f"Downloading [bold]{resource}[/bold]...")
-        try:
-            nltk.download(resource)
-            console.print(f"[green]✓ Successfully downloaded {resource}[/green]")
-        except Exception as e:
-            console.print(f"[bold red]Error downloading {resource}: {str(e)}[/bold red]")
-            console.print("[yellow]You may need to run this script with administrator privileges.[/yellow]")
+    # Only fetch what is not installed yet, checking the target directory first
+    manager = NLTKResourceManager(data_dirs=[nltk_data_dir])
+    manager.check()
+    requirements = list(NLTK_REQUIREMENTS) if args.force else manager.missing()
+    for requirement in NLTK_REQUIREMENTS:
+        if requirement not in requirements:
+            console.print(f"[green]✓ {requirement} is already installed[/green]")
+    
+    # Download one resource for each required one, falling back to its alternatives
+    for requirement in requirements:
+        console.print(f"Downloading [bold]{requirement}[/bold] ({' or '.join(NLTK_REQUIREMENTS[requirement])})...")
+        if manager.download_missing([requirement], download_dir=nltk_data_dir, quiet=False):
+            console.print(f"[bold red]Error downloading {requirement}[/bold red]")
+            console.print("[yellow]Check your network connection, or run this script with administrator privileges.[/yellow]")
             sys.exit(1)
+        console.print(f"[green]✓ Successfully downloaded {requirement}[/green]")
     
     console.print(Panel.fit(
         "[bold green]All resources downloaded successfully![/bold green]\n\n"
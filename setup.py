@@ -9,14 +9,17 @@ setup(
     install_requires=[
         "questionary>=1.10.0",
         "rich>=10.0.0",
+        "numpy>=1.22.0",
         "nltk>=3.8.1",
         "scikit-learn>=1.3.0",
+        "scipy>=1.5.0",
         "python-Levenshtein>=0.12.2",
         "spacy>=3.6.0"
     ],
     entry_points={
         'console_scripts': [
             'career-path-finder=career_path_finder.main:main',
+            'career-path-finder-server=career_path_finder.server:main',
         ],
     },
     python_requires=">=3.6",